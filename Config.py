@@ -11,6 +11,9 @@ CONFIG_MAX_RETRIES = 15
 CONFIG_PAGE_DELAY_MIN = 1  # le temps d'attente avant de passer à la page suivante (secondes)
 CONFIG_PAGE_DELAY_MAX = 2  # le temps d'attente avant de passer à la page suivante (secondes)
 
+# Débit maximal de requêtes PDP (requêtes / seconde, rafales comprises)
+CONFIG_PDP_RATE = 1.5
+
 BOUNDARIES_PER_SCRAPING = 20
 
 MAX_LISTINGS_PER_RUN = 3
@@ -29,6 +29,9 @@ import os
 
 # Load .env file
 load_dotenv()
+
+# One limiter for every PDP call made from this process
+pdp_bucket = Utils.TokenBucket(getattr(Config, "CONFIG_PDP_RATE", 1.5))
 # ------------------------------------------------------------
 # Data Validation Functions (NEW)
 # ------------------------------------------------------------
@@ -772,6 +775,8 @@ def start_scraping(logger: logging.Logger, db: sqlite3.Connection):
                                 detailed_data = None
                                 for detail_attempt in range(2):  # 2 attempts for details
                                     try:
+                                        # Pace PDP calls without stalling listings that make none
+                                        pdp_bucket.take()
                                         detailed_data = ScrapingUtils.scrape_single_result(
                                             context=context,
                                             item_search_token=request_item_token,
@@ -818,16 +823,16 @@ def start_scraping(logger: logging.Logger, db: sqlite3.Connection):
                         if details_saved_total >= DETAIL_SCRAPE_LIMIT:
                             logger.info("📊 [details] Budget exhausted — no more PDP requests this run.")
 
-                    # Small delay to avoid hammering PDP
-                    time.sleep(random.randint(
-                        max(1, Config.CONFIG_PAGE_DELAY_MIN),
-                        max(2, Config.CONFIG_PAGE_DELAY_MAX)
-                    ))
-
                 next_token = page_result['nextPageCursor']
                 if stop_everything or next_token is None or len(page_result['searchResults']) < 13:
                     break
 
+                # Space out StaysSearch pages: pdp_bucket only paces the detail calls
+                time.sleep(random.randint(
+                    max(1, Config.CONFIG_PAGE_DELAY_MIN),
+                    max(2, Config.CONFIG_PAGE_DELAY_MAX)
+                ))
+
             logger.info(f"🎯 Boundary {global_idx} completed - Total found: {total_found}, Basic saved: {basic_saved}, Detailed saved: {detailed_saved}")
 
             now = _dt.now()
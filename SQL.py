@@ -3,6 +3,23 @@ import datetime
 
 import Config
 
+# Read-side tuning for the CSV exports: sequential scans over listing_tracking
+_EXPORT_PRAGMAS = (
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-131072",
+)
+EXPORT_ARRAYSIZE = 1000
+
+
+def _export_cursor(db: sqlite3.Connection, query: str, params: tuple) -> sqlite3.Cursor:
+    """Run an export query and hand back the cursor so callers stream it in fetchmany batches."""
+    for pragma in _EXPORT_PRAGMAS:
+        db.execute(pragma)
+    cur = db.cursor()
+    cur.arraysize = EXPORT_ARRAYSIZE
+    cur.execute(query, params)
+    return cur
+
 create_boundaries_tracking_table = """
     CREATE TABLE IF NOT EXISTS "boundaries_tracking" (
         "id"	INTEGER NOT NULL UNIQUE,
@@ -57,6 +74,13 @@ create_listing_index = """
     CREATE INDEX IF NOT EXISTS idx_listing ON listing_tracking(id);
 """
 
+# Export scans: range on scraping_time in index order (no temp B-tree for the ORDER BY),
+# and the detailed-only variant seeks straight to has_detailed_data = 1
+create_listing_export_indexes = (
+    "CREATE INDEX IF NOT EXISTS idx_listing_scraping_time ON listing_tracking(scraping_time);",
+    "CREATE INDEX IF NOT EXISTS idx_listing_detail_time ON listing_tracking(has_detailed_data, scraping_time);",
+)
+
 create_tracking_table = """
     CREATE TABLE IF NOT EXISTS tracking (
         tracking INTEGER
@@ -295,13 +319,8 @@ def check_if_boundaries_exists(db: sqlite3.Connection, _id: int):
 def export_all_listings(db: sqlite3.Connection):
     min_time = datetime.datetime.now() - datetime.timedelta(days=1)
     min_ts = int(min_time.timestamp())
+    # id is the primary key (rows are INSERT OR REPLACEd), so each listing appears once
     query = """
-      WITH latest AS (
-        SELECT *,
-               ROW_NUMBER() OVER (PARTITION BY id ORDER BY scraping_time DESC) AS rn
-        FROM listing_tracking
-        WHERE scraping_time >= ?
-      )
       SELECT
         id,
         ListingObjType          AS type,
@@ -337,13 +356,11 @@ def export_all_listings(db: sqlite3.Connection):
             THEN 'https://www.airbnb.com/users/show/' || userId
             ELSE NULL 
         END                     AS host_url
-      FROM latest
-      WHERE rn = 1
-      ORDER BY scrape_time DESC;
+      FROM listing_tracking
+      WHERE scraping_time >= ?
+      ORDER BY scraping_time DESC;
     """
-    cur = db.cursor()
-    cur.execute(query, (min_ts,))
-    return cur.fetchall()
+    return _export_cursor(db, query, (min_ts,))
 
 
 
@@ -361,17 +378,10 @@ def export_listings_by_type(db: sqlite3.Connection, detailed_only: bool = False)
                    THEN 'https://www.airbnb.com/users/show/' || userId
                    ELSE NULL 
                END AS url_hote
-        FROM (
-            SELECT *,
-                   ROW_NUMBER() OVER (PARTITION BY id ORDER BY scraping_time DESC) AS rn
-            FROM listing_tracking
-            WHERE scraping_time >= ? {detail_filter}
-        )
-        WHERE rn = 1;
+        FROM listing_tracking
+        WHERE scraping_time >= ? {detail_filter};
     """
-    cur = db.cursor()
-    cur.execute(query, (min_time_timestamp,))
-    return cur.fetchall()
+    return _export_cursor(db, query, (min_time_timestamp,))
 
 def get_tracking(db: sqlite3.Connection):
     cur = db.cursor()
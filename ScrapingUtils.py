@@ -1,4 +1,6 @@
+import functools
 import json
+import orjson
 import os.path
 import sqlite3
 import base64
@@ -7,6 +9,7 @@ import logging
 import re
 import urllib.parse
 from datetime import datetime
+from types import MappingProxyType
 from playwright.sync_api import (
     Page, BrowserContext, Request, APIResponse, TimeoutError
 )
@@ -17,9 +20,35 @@ import Utils
 from HumanMouseMovement import HumanMouseMovement
 import time
 
+# Pseudo/forbidden headers dropped before replaying intercepted requests
+_HEADER_IGNORE = frozenset({':authority', ':method', ':path', ':scheme', 'content-length'})
+
+# Constants for _normalize_listing_id (built once, not per call)
+_DIGITS_RE = re.compile(r"\d+")
+_ID_PREFIX_RE = re.compile(r"(?:StayListing|DemandStayListing|StayListingProduct|listing):|rooms/")
+_B64_ID_PREFIXES = ("StayListing:", "DemandStayListing:", "StayListingProduct:")
+_B64_ALPHABET = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=")
+
 logging.getLogger().setLevel(logging.DEBUG)
 
 
+def _dig(obj, *path, default=None):
+    """
+    Walk nested dicts by key; `default` as soon as a level is missing or not a dict (no throwaway {} per miss)
+    """
+    for k in path:
+        if not isinstance(obj, dict):
+            return default
+        obj = obj.get(k)
+        if obj is None:
+            return default
+    return obj
+
+
+# Shared read-only stand-in for a missing PDP section payload
+_EMPTY_SECTION = MappingProxyType({})
+
+
 def _normalize_listing_id(raw_id, item=None):
     """
     Improved ID normalization with better handling of large numbers
@@ -37,57 +66,69 @@ def _normalize_listing_id(raw_id, item=None):
         return str(raw_id)
 
     if isinstance(raw_id, str):
-        s = raw_id.strip()
+        # Clean ids are the common case and skip the cache entirely
+        if raw_id.isdigit():
+            return raw_id
+        return _normalize_listing_id_str(raw_id)
+
+    return None
+
+
+@functools.lru_cache(maxsize=8192)
+def _normalize_listing_id_str(raw_id: str):
+    """
+    String branch of _normalize_listing_id, memoized: the same ids recur across pages and retries
+    """
+    s = raw_id.strip()
+    
+    # Check if it's already a clean numeric string
+    if s.isdigit():
+        return s
         
-        # Check if it's already a clean numeric string
-        if s.isdigit():
-            return s
-            
-        # Handle very large numbers that might have been converted to scientific notation
+    # Handle very large numbers that might have been converted to scientific notation
+    try:
+        if 'e+' in s.lower():
+            return str(int(float(s)))
+    except ValueError:
+        pass
+
+    # Extract from prefixed formats: first digit run after the prefix
+    m = _ID_PREFIX_RE.search(s)
+    if m:
+        d = _DIGITS_RE.search(s, m.end())
+        if d:
+            return d.group(0)
+
+    # URL extraction
+    if "/" in s and "rooms" in s:
+        parts = [p for p in s.split("/") if p]
+        for p in reversed(parts):  # Check from end first
+            if p.isdigit():
+                return p
+
+    # Base64 decoding - but be more careful
+    # Only try base64 on longer strings made of base64 characters
+    if len(s) > 10 and not s.isdigit() and _B64_ALPHABET.issuperset(s):
         try:
-            if 'e+' in s.lower():
-                return str(int(float(s)))
-        except ValueError:
+            # Add padding if missing
+            missing = len(s) % 4
+            if missing:
+                s += "=" * (4 - missing)
+            decoded = base64.b64decode(s).decode("utf-8", errors="ignore")
+            
+            # Extract numeric part from decoded string
+            for prefix in _B64_ID_PREFIXES:
+                if prefix in decoded:
+                    numeric_part = decoded.split(prefix)[-1].split(",")[0].strip()
+                    if numeric_part.isdigit():
+                        return numeric_part
+                        
+            # If decoded is just digits
+            if decoded.strip().isdigit():
+                return decoded.strip()
+        except Exception:
             pass
 
-        # Extract from prefixed formats
-        for prefix in ("StayListing:", "DemandStayListing:", "StayListingProduct:", "listing:", "rooms/"):
-            if prefix in s:
-                tail = s.split(prefix)[-1]
-                # Extract only the numeric part
-                digits = re.findall(r"\d+", tail)
-                if digits:
-                    return digits[0]
-
-        # URL extraction
-        if "/" in s and "rooms" in s:
-            parts = [p for p in s.split("/") if p]
-            for p in reversed(parts):  # Check from end first
-                if p.isdigit():
-                    return p
-
-        # Base64 decoding - but be more careful
-        if len(s) > 10 and not s.isdigit():  # Only try base64 on longer strings
-            try:
-                # Add padding if missing
-                missing = len(s) % 4
-                if missing:
-                    s += "=" * (4 - missing)
-                decoded = base64.b64decode(s).decode("utf-8", errors="ignore")
-                
-                # Extract numeric part from decoded string
-                for prefix in ("StayListing:", "DemandStayListing:", "StayListingProduct:"):
-                    if prefix in decoded:
-                        numeric_part = decoded.split(prefix)[-1].split(",")[0].strip()
-                        if numeric_part.isdigit():
-                            return numeric_part
-                            
-                # If decoded is just digits
-                if decoded.strip().isdigit():
-                    return decoded.strip()
-            except Exception:
-                pass
-
     return None
 
 def execute_max_tries(function, logger: logging.Logger):
@@ -145,6 +186,108 @@ def login_user(context: BrowserContext, page: Page, logger: logging.Logger):
     return new_page
 
 
+# Popup dismiss targets, highest priority first (Playwright selector syntax)
+_TRANSLATION_POPUP_SELECTORS = (
+    # Direct translation modal close button
+    'div[role="dialog"]:has-text("Translation on") button[aria-label="Close"]',
+    'div[role="dialog"]:has-text("Translation") button[aria-label="Close"]',
+    'div[role="dialog"]:has-text("translation") button[aria-label="Close"]',
+
+    # Translation modal with specific text
+    'div:has-text("Translation on") button[aria-label="Close"]',
+    'div:has-text("This symbol shows when content") button[aria-label="Close"]',
+    'div:has-text("automatically translated") button[aria-label="Close"]',
+
+    # Translation settings and buttons
+    'button:has-text("Got it")',
+    'button:has-text("No thanks")',
+    'button:has-text("Not now")',
+    'button:has-text("Continue in English")',
+    'button:has-text("Keep using English")',
+    'button:has-text("Dismiss")',
+
+    # Translation banner elements
+    '[data-testid="translation-banner-dismiss"]',
+    '[data-testid="language-detector-decline"]',
+    '[data-testid="language-banner-dismiss"]',
+    'div[data-testid="translation-bar"] button',
+
+    # Generic close buttons in translation context
+    '[aria-label="Close translation dialog"]',
+    '[aria-label="Close translation modal"]',
+)
+
+_GENERAL_POPUP_SELECTORS = (
+    # Generic dialog close buttons
+    'div[role="dialog"] button[aria-label="Close"]',
+    'div[role="dialog"] [data-testid="modal-sheet-close-button"]',
+    'div[role="dialog"] button:has-text("Close")',
+    '[data-testid="modal-container"] button[aria-label="Close"]',
+    'button[aria-label="Close dialog"]',
+    'button[aria-label="Dismiss"]',
+
+    # Cookie banners
+    'button:has-text("Accept")',
+    'button:has-text("Accept all cookies")',
+    '[data-testid="accept-btn"]',
+
+    # Other common dismissal buttons
+    'button:has-text("OK")',
+    'button:has-text("Continue")',
+    'button:has-text("Skip")',
+)
+
+# One in-page pass: first selector (translation list first) with a visible match, and whether
+# any dialog is visible. Only the `scope:has-text("...") [target]` form is emulated here.
+_POPUP_PROBE_JS = """
+({translation, general}) => {
+  const norm = s => (s || "").replace(/\\s+/g, " ").toLowerCase();
+  const visible = el => {
+    const r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== "hidden";
+  };
+  const HAS_TEXT = /^(.*?):has-text\\("(.*?)"\\)\\s*(.*)$/;
+  const matches = sel => {
+    const m = sel.match(HAS_TEXT);
+    if (!m) return Array.from(document.querySelectorAll(sel));
+    const [, scope, text, inner] = m;
+    const t = text.toLowerCase();
+    if (!inner) {
+      return Array.from(document.querySelectorAll(scope)).filter(e => norm(e.textContent).includes(t));
+    }
+    return Array.from(document.querySelectorAll(inner)).filter(e => {
+      for (let a = e.parentElement; a; a = a.parentElement) {
+        if (a.matches(scope) && norm(a.textContent).includes(t)) return true;
+      }
+      return false;
+    });
+  };
+  const first = sels => {
+    for (const s of sels) {
+      try { if (matches(s).some(visible)) return s; } catch (e) {}
+    }
+    return null;
+  };
+  const tr = first(translation);
+  return {
+    hit: tr || first(general),
+    translation: !!tr,
+    dialog: Array.from(document.querySelectorAll('div[role="dialog"]')).some(visible),
+  };
+}
+"""
+
+
+def _probe_popups(page: Page) -> dict:
+    try:
+        return page.evaluate(_POPUP_PROBE_JS, {
+            "translation": list(_TRANSLATION_POPUP_SELECTORS),
+            "general": list(_GENERAL_POPUP_SELECTORS),
+        })
+    except Exception:
+        return {"hit": None, "translation": False, "dialog": False}
+
+
 def _dismiss_any_popups_enhanced(page: Page, logger: logging.Logger | None = None, max_attempts=3):
     """
     Enhanced popup dismissal that handles translation dialogs and other Airbnb modals
@@ -152,138 +295,49 @@ def _dismiss_any_popups_enhanced(page: Page, logger: logging.Logger | None = Non
     attempts = 0
     dismissed_something = False
 
+    # Which dismiss target (if any) is visible is decided in-page, one round-trip per attempt
+    probe = _probe_popups(page)
+
     while attempts < max_attempts:
+        if not probe["hit"] and not probe["dialog"]:
+            break
+
         attempts += 1
         current_dismissed = False
 
         if logger:
-            logger.info(f"[popup] Dismissal attempt {attempts}/{max_attempts}")
-
-        # Translation-specific selectors (HIGHEST PRIORITY)
-        translation_selectors = [
-            # Direct translation modal close button
-            'div[role="dialog"]:has-text("Translation on") button[aria-label="Close"]',
-            'div[role="dialog"]:has-text("Translation") button[aria-label="Close"]',
-            'div[role="dialog"]:has-text("translation") button[aria-label="Close"]',
-
-            # Translation modal with specific text
-            'div:has-text("Translation on") button[aria-label="Close"]',
-            'div:has-text("This symbol shows when content") button[aria-label="Close"]',
-            'div:has-text("automatically translated") button[aria-label="Close"]',
-
-            # Translation settings and buttons
-            'button:has-text("Got it")',
-            'button:has-text("No thanks")',
-            'button:has-text("Not now")',
-            'button:has-text("Continue in English")',
-            'button:has-text("Keep using English")',
-            'button:has-text("Dismiss")',
-
-            # Translation banner elements
-            '[data-testid="translation-banner-dismiss"]',
-            '[data-testid="language-detector-decline"]',
-            '[data-testid="language-banner-dismiss"]',
-            'div[data-testid="translation-bar"] button',
-
-            # Generic close buttons in translation context
-            '[aria-label="Close translation dialog"]',
-            '[aria-label="Close translation modal"]',
-        ]
+            logger.info("[popup] Dismissal attempt %d/%d", attempts, max_attempts)
 
-        # Try translation selectors first
-        for sel in translation_selectors:
+        # Click the first visible target (translation selectors have the highest priority)
+        hit = probe["hit"]
+        if hit:
             try:
-                elements = page.locator(sel)
-                count = elements.count()
-                if logger and count > 0:
-                    logger.info(f"[popup] Found {count} translation elements with selector: {sel}")
-
-                for i in range(count):
-                    try:
-                        element = elements.nth(i)
-                        if element.is_visible(timeout=500):
-                            if logger:
-                                logger.info(f"[popup] Clicking translation element {i+1}: {sel}")
-                            element.click(timeout=3000, force=True)
-                            page.wait_for_timeout(800)
-                            current_dismissed = True
-                            dismissed_something = True
-                    except Exception as e:
-                        if logger:
-                            logger.info(f"[popup] Failed to click translation element {i+1}: {e}")
-                        continue
-
-                if current_dismissed:
-                    break
-
+                if logger:
+                    kind = "translation" if probe["translation"] else "general"
+                    logger.info("[popup] Clicking %s element: %s", kind, hit)
+                page.locator(f"{hit} >> visible=true").first.click(timeout=3000, force=True)
+                page.wait_for_timeout(800 if probe["translation"] else 500)
+                current_dismissed = True
+                dismissed_something = True
             except Exception as e:
                 if logger:
-                    logger.info(f"[popup] Translation selector failed: {sel} - {e}")
-                continue
-
-        # General modal close selectors (lower priority)
-        if not current_dismissed:
-            general_selectors = [
-                # Generic dialog close buttons
-                'div[role="dialog"] button[aria-label="Close"]',
-                'div[role="dialog"] [data-testid="modal-sheet-close-button"]',
-                'div[role="dialog"] button:has-text("Close")',
-                '[data-testid="modal-container"] button[aria-label="Close"]',
-                'button[aria-label="Close dialog"]',
-                'button[aria-label="Dismiss"]',
-
-                # Cookie banners
-                'button:has-text("Accept")',
-                'button:has-text("Accept all cookies")',
-                '[data-testid="accept-btn"]',
-
-                # Other common dismissal buttons
-                'button:has-text("OK")',
-                'button:has-text("Continue")',
-                'button:has-text("Skip")',
-            ]
-
-            for sel in general_selectors:
-                try:
-                    elements = page.locator(sel)
-                    count = elements.count()
-
-                    for i in range(count):
-                        try:
-                            element = elements.nth(i)
-                            if element.is_visible(timeout=500):
-                                if logger:
-                                    logger.info(f"[popup] Clicking general element {i+1}: {sel}")
-                                element.click(timeout=3000, force=True)
-                                page.wait_for_timeout(500)
-                                current_dismissed = True
-                                dismissed_something = True
-                        except Exception:
-                            continue
-
-                    if current_dismissed:
-                        break
-
-                except Exception:
-                    continue
+                    logger.info("[popup] Failed to click %s: %s", hit, e)
 
         # Enhanced ESC key handling for stubborn modals
-        if not current_dismissed:
+        if not current_dismissed and probe["dialog"]:
             try:
-                dialogs = page.locator('div[role="dialog"]:visible')
-                if dialogs.count() > 0:
-                    if logger:
-                        logger.info(f"[popup] Found {dialogs.count()} visible dialogs, pressing Escape")
+                if logger:
+                    logger.info("[popup] Visible dialog without a close target, pressing Escape")
 
-                    for _ in range(3):
-                        page.keyboard.press("Escape")
-                        page.wait_for_timeout(200)
+                for _ in range(3):
+                    page.keyboard.press("Escape")
+                    page.wait_for_timeout(200)
 
-                    current_dismissed = True
-                    dismissed_something = True
+                current_dismissed = True
+                dismissed_something = True
             except Exception as e:
                 if logger:
-                    logger.info(f"[popup] ESC key handling failed: {e}")
+                    logger.info("[popup] ESC key handling failed: %s", e)
 
         # Enhanced click-away with multiple targets
         try:
@@ -310,7 +364,7 @@ def _dismiss_any_popups_enhanced(page: Page, logger: logging.Logger | None = Non
                             for cx, cy in positions:
                                 try:
                                     if logger:
-                                        logger.info(f"[popup] Click-away on {target_sel} at ({cx}, {cy})")
+                                        logger.info("[popup] Click-away on %s at (%s, %s)", target_sel, cx, cy)
                                     page.mouse.click(cx, cy)
                                     page.wait_for_timeout(200)
                                     clicked_away = True
@@ -335,7 +389,7 @@ def _dismiss_any_popups_enhanced(page: Page, logger: logging.Logger | None = Non
 
                     for cx, cy in positions:
                         if logger:
-                            logger.info(f"[popup] Click-away on viewport at ({cx}, {cy})")
+                            logger.info("[popup] Click-away on viewport at (%s, %s)", cx, cy)
                         page.mouse.click(cx, cy)
                         page.wait_for_timeout(200)
                 except Exception:
@@ -343,7 +397,7 @@ def _dismiss_any_popups_enhanced(page: Page, logger: logging.Logger | None = Non
 
         except Exception as e:
             if logger:
-                logger.info(f"[popup] Click-away failed: {e}")
+                logger.info("[popup] Click-away failed: %s", e)
 
         # Wait for overlays to disappear with timeout
         try:
@@ -359,7 +413,7 @@ def _dismiss_any_popups_enhanced(page: Page, logger: logging.Logger | None = Non
                     overlays = page.locator(overlay_sel)
                     if overlays.count() > 0:
                         if logger:
-                            logger.info(f"[popup] Waiting for {overlays.count()} overlays to disappear: {overlay_sel}")
+                            logger.info("[popup] Waiting for %d overlays to disappear: %s", overlays.count(), overlay_sel)
                         overlays.first.wait_for(state="hidden", timeout=2000)
                 except Exception:
                     pass
@@ -367,13 +421,11 @@ def _dismiss_any_popups_enhanced(page: Page, logger: logging.Logger | None = Non
             pass
 
         # Check if we need to continue (if any dialogs are still visible)
-        try:
-            still_has_dialog = page.locator('div[role="dialog"]:visible').count() > 0
-            if logger:
-                logger.info(f"[popup] Still has dialogs: {still_has_dialog}")
-            if not still_has_dialog:
-                break
-        except Exception:
+        probe = _probe_popups(page)
+        still_has_dialog = probe["dialog"]
+        if logger:
+            logger.info("[popup] Still has dialogs: %s", still_has_dialog)
+        if not still_has_dialog:
             break
 
         # Additional wait between attempts
@@ -381,9 +433,9 @@ def _dismiss_any_popups_enhanced(page: Page, logger: logging.Logger | None = Non
             page.wait_for_timeout(500)
 
     if logger and dismissed_something:
-        logger.info(f"[popup] Completed dismissal after {attempts} attempts")
+        logger.info("[popup] Completed dismissal after %d attempts", attempts)
     elif logger:
-        logger.info(f"[popup] No popups found to dismiss after {attempts} attempts")
+        logger.info("[popup] No popups found to dismiss after %d attempts", attempts)
 
     return dismissed_something
 
@@ -661,9 +713,8 @@ def scrape_page_result(
 
     # -------- request --------
     if base_headers:
-        ignore = {':authority', ':method', ':path', ':scheme', 'content-length'}
         headers = {k: v for k, v in base_headers.items()
-                   if k.lower() not in ignore and not k.startswith(':')}
+                   if k.lower() not in _HEADER_IGNORE and not k.startswith(':')}
         headers.update({
             "content-type": "application/json",
             "origin": "https://www.airbnb.com",
@@ -707,22 +758,22 @@ def scrape_page_result(
             url=url,
             headers=headers,
             params=querystring,
-            data=json.dumps(payload),
+            data=orjson.dumps(payload),
             timeout=30000,
         )
     except Exception as e:
         logger.error(f"[StaysSearch] Request failed: {e}")
         raise RuntimeError(f"StaysSearch request failed: {e}")
 
-    txt = response.text()
+    body = response.body()
     if response.status != 200:
-        logger.error(f"[StaysSearch] HTTP {response.status} {response.status_text}\n{txt}")
+        logger.error(f"[StaysSearch] HTTP {response.status} {response.status_text}\n{body.decode('utf-8', 'replace')}")
         raise RuntimeError(f"StaysSearch HTTP {response.status}")
 
     try:
-        json_data = json.loads(txt)
+        json_data = orjson.loads(body)
     except Exception as e:
-        logger.error(f"[StaysSearch] JSON parse error: {e}\nRaw: {txt[:600]}")
+        logger.error(f"[StaysSearch] JSON parse error: {e}\nRaw: {body[:600].decode('utf-8', 'replace')}")
         raise
 
     # Debug: Save raw response for inspection
@@ -737,7 +788,7 @@ def scrape_page_result(
         logger.error(f"[StaysSearch] GraphQL errors: {json.dumps(json_data['errors'], indent=2)[:1000]}")
 
     # Enhanced data extraction with debugging
-    data_root = (json_data.get('data') or {}).get('presentation', {}).get('staysSearch', {})
+    data_root = _dig(json_data, 'data', 'presentation', 'staysSearch') or {}
     if not data_root:
         logger.warning(f"[StaysSearch] Primary path failed. Exploring response structure...")
 
@@ -965,7 +1016,7 @@ def scrape_page_result(
                 listing.get('title')
                 or listing.get('name')
                 or listing.get('localizedTitle')
-                or (listing.get('presentation', {}) or {}).get('title')
+                or _dig(listing, 'presentation', 'title')
                 or item.get('title')
                 or item.get('name')
             )
@@ -994,9 +1045,9 @@ def scrape_page_result(
                     if not isinstance(node, dict):
                         continue
                     price_info['price'] = _pick(
-                        (node.get('price', {}) or {}).get('amountFormatted'),
-                        (node.get('pricingQuote', {}) or {}).get('priceString'),
-                        (node.get('priceMetadata', {}) or {}).get('displayRate'),
+                        _dig(node, 'price', 'amountFormatted'),
+                        _dig(node, 'pricingQuote', 'priceString'),
+                        _dig(node, 'priceMetadata', 'displayRate'),
                         node.get('displayPrice'),
                         node.get('price'),
                     )
@@ -1124,6 +1175,127 @@ def scrape_page_result(
     return export
 
 
+@functools.lru_cache(maxsize=4096)
+def _decode_user_id(user_id_b64: str) -> str:
+    """Numeric tail of a base64 "User:<digits>" id; only the tail bytes are decoded (memoized per host)."""
+    try:
+        raw = base64.b64decode(user_id_b64)
+        return raw.rpartition(b':')[2].decode('ascii')
+    except Exception:
+        return str(user_id_b64)
+
+
+@functools.lru_cache(maxsize=64)
+def _extensions_json(token: str) -> str:
+    """Encoded persisted-query extensions; fully determined by the PDP token."""
+    return orjson.dumps({'persistedQuery': {'version': 1, 'sha256Hash': token}}).decode()
+
+
+def _pdp_availability(section_data: dict, export: dict):
+    export['location'] = section_data.get('localizedLocation') or None
+    export["maxGuestCapacity"] = section_data.get('maxGuestCapacity', 0)
+
+
+def _pdp_reviews(section_data: dict, export: dict):
+    export['isGuestFavorite'] = bool(section_data.get('isGuestFavorite', False))
+    export['reviewsCount'] = section_data.get('overallCount', export['reviewsCount'])
+    export['averageRating'] = section_data.get('overallRating', export['averageRating'])
+
+
+def _pdp_location(section_data: dict, export: dict):
+    export['lat'] = section_data.get('lat', None)
+    export['lng'] = section_data.get('lng', None)
+
+
+def _pdp_meet_your_host(section_data: dict, export: dict):
+    cardData = section_data.get('cardData', {}) or {}
+    export['host'] = cardData.get('name', export['host'])
+    export['isSuperhost'] = cardData.get('isSuperhost', export['isSuperhost'])
+    export['isVerified'] = cardData.get('isVerified', export['isVerified'])
+    export['ratingCount'] = cardData.get('ratingCount', export['ratingCount'])
+    userId = cardData.get('userId')
+    if userId:
+        export['userId'] = _decode_user_id(userId) if isinstance(userId, str) else str(userId)
+    timeAsHost = cardData.get('timeAsHost', {}) or {}
+    export['years'] = timeAsHost.get('years', 0)
+    export['months'] = timeAsHost.get('months', 0)
+    export['hostrAtingAverage'] = cardData.get('ratingAverage', export['hostrAtingAverage'])
+
+
+@functools.lru_cache(maxsize=8192)
+def _b64_stay_listing(listing_id: str) -> str:
+    """GraphQL node id for a listing (base64 of "StayListing:<id>"), reused across retries."""
+    return base64.b64encode(f"StayListing:{listing_id}".encode('utf-8')).decode('utf-8')
+
+
+# Listing-independent part of pdpSectionsRequest (the per-listing fields are added per call)
+_PDP_REQUEST_DEFAULTS = {
+    'adults': '1',
+    'amenityFilters': None,
+    'bypassTargetings': False,
+    'causeId': None,
+    'children': '0',
+    'disasterId': None,
+    'discountedGuestFeeVersion': None,
+    'displayExtensions': None,
+    'forceBoostPriorityMessageType': None,
+    'hostPreview': False,
+    'infants': '0',
+    'interactionType': None,
+    'layouts': ['SIDEBAR', 'SINGLE_COLUMN'],
+    'pets': 0,
+    'pdpTypeOverride': None,
+    'preview': False,
+    'previousStateCheckIn': None,
+    'previousStateCheckOut': None,
+    'priceDropSource': None,
+    'privateBooking': False,
+    'promotionUuid': None,
+    'relaxedAmenityIds': None,
+    'searchId': None,
+    'selectedCancellationPolicyId': None,
+    'selectedRatePlanId': None,
+    'splitStays': None,
+    'staysBookingMigrationEnabled': False,
+    'translateUgc': False,
+    'useNewSectionWrapperApi': False,
+    'sectionIds': None,
+}
+
+# Layered over intercepted headers for PDP calls
+_PDP_OVERRIDE_HEADERS = {
+    "x-airbnb-supports-airlock-v2": "true",
+    "x-airbnb-graphql-platform": "web",
+    "x-airbnb-graphql-platform-client": "minimalist-niobe",
+    "x-niobe-short-circuited": "true",
+    "x-csrf-without-token": "1",
+    "origin": "https://www.airbnb.com",
+    "accept-language": "en-US,en;q=0.9",
+}
+
+# Used when no headers were intercepted (key/client ids and referer are added per call)
+_PDP_DEFAULT_HEADERS = {
+    "x-airbnb-supports-airlock-v2": "true",
+    "x-csrf-without-token": "1",
+    "x-airbnb-graphql-platform": "web",
+    "x-airbnb-graphql-platform-client": "minimalist-niobe",
+    "x-niobe-short-circuited": "true",
+    "origin": "https://www.airbnb.com",
+    "accept-language": "en-US,en;q=0.9",
+    "connection": "keep-alive",
+    "priority": "u=4",
+}
+
+
+# PDP sectionId -> handler(section_data, export)
+_PDP_SECTION_HANDLERS = {
+    'AVAILABILITY_CALENDAR_DEFAULT': _pdp_availability,
+    'REVIEWS_DEFAULT': _pdp_reviews,
+    'LOCATION_DEFAULT': _pdp_location,
+    'MEET_YOUR_HOST': _pdp_meet_your_host,
+}
+
+
 def scrape_single_result(context: BrowserContext, item_search_token: str, listing_info: dict,
                          logger: logging.Logger, api_key: str, client_version, client_request_id,
                          federated_search_id: str, currency: str, locale: str,
@@ -1132,79 +1304,42 @@ def scrape_single_result(context: BrowserContext, item_search_token: str, listin
     if not _id:
         raise ValueError(f"listing_info.id is not numeric: {listing_info['id']!r}")
 
-    logger.info(f"=> Downloading the listing {listing_info.get('title')} | {listing_info.get('link')}")
+    logger.info("=> Downloading the listing %s | %s", listing_info.get('title'), listing_info.get('link'))
 
     url = f"https://www.airbnb.com/api/v3/StaysPdpSections/{item_search_token}"
 
-    item_id = base64.b64encode(f"StayListing:{_id}".encode('utf-8')).decode('utf-8')
+    item_id = _b64_stay_listing(_id)
 
     # IMPORTANT: add useContextualUser (required Boolean!)
     variables = {
         'id': item_id,
         'useContextualUser': False,
         'pdpSectionsRequest': {
-            'adults': '1',
-            'amenityFilters': None,
-            'bypassTargetings': False,
+            **_PDP_REQUEST_DEFAULTS,
             'categoryTag': listing_info.get('categoryTag'),
-            'causeId': None,
-            'children': '0',
-            'disasterId': None,
-            'discountedGuestFeeVersion': None,
-            'displayExtensions': None,
             'federatedSearchId': federated_search_id,
-            'forceBoostPriorityMessageType': None,
-            'hostPreview': False,
-            'infants': '0',
-            'interactionType': None,
-            'layouts': ['SIDEBAR', 'SINGLE_COLUMN'],
-            'pets': 0,
-            'pdpTypeOverride': None,
             'photoId': listing_info.get('photoId'),
-            'preview': False,
-            'previousStateCheckIn': None,
-            'previousStateCheckOut': None,
-            'priceDropSource': None,
-            'privateBooking': False,
-            'promotionUuid': None,
-            'relaxedAmenityIds': None,
-            'searchId': None,
-            'selectedCancellationPolicyId': None,
-            'selectedRatePlanId': None,
-            'splitStays': None,
-            'staysBookingMigrationEnabled': False,
-            'translateUgc': False,
-            'useNewSectionWrapperApi': False,
-            'sectionIds': None,
             'checkIn': listing_info.get('checkin'),
             'checkOut': listing_info.get('checkout'),
             'p3ImpressionId': f'p3_{int(time.time())}_P3lbdkkYZMTFJexg'
         }
     }
-    extensions = {'persistedQuery': {'version': 1, 'sha256Hash': item_search_token}}
-    querystring = {
+    # Query string encoded once here and appended to the URL (no params= re-serialization per call)
+    querystring = urllib.parse.urlencode({
         "operationName": "StaysPdpSections",
         "locale": locale,
         "currency": currency,
-        "variables": json.dumps(variables),
-        "extensions": json.dumps(extensions)
-    }
+        "variables": orjson.dumps(variables).decode(),
+        "extensions": _extensions_json(item_search_token)
+    }, quote_via=urllib.parse.quote)
 
     # Build headers from intercepted ones (fixes invalid_key); keep referer
+    referer = listing_info.get("link", "https://www.airbnb.com/")
     if base_headers:
-        ignore = {':authority', ':method', ':path', ':scheme', 'content-length'}
         headers = {k: v for k, v in base_headers.items()
-                   if k.lower() not in ignore and not k.startswith(':')}
-        headers.update({
-            "x-airbnb-supports-airlock-v2": "true",
-            "x-airbnb-graphql-platform": "web",
-            "x-airbnb-graphql-platform-client": "minimalist-niobe",
-            "x-niobe-short-circuited": "true",
-            "x-csrf-without-token": "1",
-            "origin": "https://www.airbnb.com",
-            "referer": listing_info.get("link", "https://www.airbnb.com/"),
-            "accept-language": "en-US,en;q=0.9",
-        })
+                   if k.lower() not in _HEADER_IGNORE and not k.startswith(':')}
+        headers.update(_PDP_OVERRIDE_HEADERS)
+        headers["referer"] = referer
         if api_key:
             headers["x-airbnb-api-key"] = api_key
         if client_version:
@@ -1213,35 +1348,32 @@ def scrape_single_result(context: BrowserContext, item_search_token: str, listin
             headers["x-client-request-id"] = client_request_id
     else:
         headers = {
-            "x-airbnb-supports-airlock-v2": "true",
+            **_PDP_DEFAULT_HEADERS,
             "x-airbnb-api-key": api_key,
-            "x-csrf-without-token": "1",
-            "x-airbnb-graphql-platform": "web",
-            "x-airbnb-graphql-platform-client": "minimalist-niobe",
-            "x-niobe-short-circuited": "true",
             "x-client-version": client_version,
             "x-client-request-id": client_request_id,
-            "origin": "https://www.airbnb.com",
-            "referer": listing_info.get("link", "https://www.airbnb.com/"),
-            "accept-language": "en-US,en;q=0.9",
-            "connection": "keep-alive",
-            "priority": "u=4",
+            "referer": referer,
         }
 
     if headers.get("x-airbnb-api-key"):
         k = headers["x-airbnb-api-key"]
-        logger.info(f"[PDP] Using API key: {k[:6]}…{k[-4:]}")
+        logger.info("[PDP] Using API key: %s…%s", k[:6], k[-4:])
 
     response = context.request.get(
-        url=url, headers=headers, params=querystring, timeout=30000
+        url=f"{url}?{querystring}", headers=headers, timeout=30000
     )
 
-    txt = response.text()
+    # Read the body once; only a short slice is ever decoded to text (for error logs)
+    body = response.body()
     if response.status != 200:
-        logger.error(f"[PDP] HTTP {response.status} {response.status_text}\n{txt[:600]}")
+        logger.error("[PDP] HTTP %s %s\n%s", response.status, response.status_text, body[:600].decode('utf-8', 'replace'))
         return {'skip': True}
 
-    json_data = json.loads(txt)
+    try:
+        json_data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        logger.error("[PDP] non-JSON response: %s", body[:200].decode('utf-8', 'replace'))
+        return {'skip': True}
 
     # If GraphQL reports any error, skip gracefully (avoid NoneType crashes)
     if json_data.get("errors"):
@@ -1252,20 +1384,14 @@ def scrape_single_result(context: BrowserContext, item_search_token: str, listin
         return {'skip': True}
 
     # Safe navigation to the sections payload
-    data_root = (((json_data.get('data') or {}).get('presentation') or {})
-                 .get('stayProductDetailPage') or {})
+    data_root = _dig(json_data, 'data', 'presentation', 'stayProductDetailPage') or {}
     if not data_root:
         logger.info("[PDP] No data payload present; skipping.")
         return {'skip': True}
 
     main_sections = data_root.get('sections') or {}
     # sbui Data (optional)
-    try:
-        sbuiData = (((main_sections.get('sbuiData') or {})
-                     .get('sectionConfiguration') or {})
-                    .get('root') or {}).get('sections') or []
-    except Exception:
-        sbuiData = []
+    sbuiData = _dig(main_sections, 'sbuiData', 'sectionConfiguration', 'root', 'sections') or []
 
     export = {
         'airbnbLuxe': False,
@@ -1301,37 +1427,14 @@ def scrape_single_result(context: BrowserContext, item_search_token: str, listin
         logger.info("[PDP] Unexpected sections structure; skipping.")
         return {'skip': True}
 
+    # Walk every section: with both layouts requested a sectionId can repeat, and the
+    # last occurrence wins (as with the original if/elif chain)
     for section in data_sections:
         try:
-            sectionId = section.get('sectionId')
-            section_data = section.get('section', {}) or {}
-            if sectionId == 'AVAILABILITY_CALENDAR_DEFAULT':
-                export['location'] = section_data.get('localizedLocation') or None
-                export["maxGuestCapacity"] = section_data.get('maxGuestCapacity', 0)
-            elif sectionId == 'REVIEWS_DEFAULT':
-                export['isGuestFavorite'] = bool(section_data.get('isGuestFavorite', False))
-                export['reviewsCount'] = section_data.get('overallCount', export['reviewsCount'])
-                export['averageRating'] = section_data.get('overallRating', export['averageRating'])
-            elif sectionId == 'LOCATION_DEFAULT':
-                export['lat'] = section_data.get('lat', None)
-                export['lng'] = section_data.get('lng', None)
-            elif sectionId == 'MEET_YOUR_HOST':
-                cardData = section_data.get('cardData', {}) or {}
-                export['host'] = cardData.get('name', export['host'])
-                export['isSuperhost'] = cardData.get('isSuperhost', export['isSuperhost'])
-                export['isVerified'] = cardData.get('isVerified', export['isVerified'])
-                export['ratingCount'] = cardData.get('ratingCount', export['ratingCount'])
-                userId = cardData.get('userId')
-                if userId:
-                    try:
-                        decoded = base64.b64decode(userId.encode('utf-8')).decode('utf-8')
-                        export['userId'] = decoded.split(':')[-1]
-                    except Exception:
-                        export['userId'] = str(userId)
-                timeAsHost = cardData.get('timeAsHost', {}) or {}
-                export['years'] = timeAsHost.get('years', 0)
-                export['months'] = timeAsHost.get('months', 0)
-                export['hostrAtingAverage'] = cardData.get('ratingAverage', export['hostrAtingAverage'])
+            handler = _PDP_SECTION_HANDLERS.get(section.get('sectionId'))
+            if handler is None:
+                continue
+            handler(section.get('section') or _EMPTY_SECTION, export)
         except Exception as e:
             logger.debug(f"[PDP] Section parse error: {e}")
 
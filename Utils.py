@@ -6,6 +6,8 @@ import Config
 import os
 import math
 import re
+import threading
+import time
 import requests
 import SQL
 from openpyxl import Workbook
@@ -28,9 +30,36 @@ def connect_db() -> sqlite3.Connection:
     SQL.execute_sql_query_no_results(db, SQL.create_listing_tracking_table)
     SQL.execute_sql_query_no_results(db, SQL.create_boundaries_tracking_table)
     SQL.execute_sql_query_no_results(db, SQL.create_listing_index)
+    for ddl in SQL.create_listing_export_indexes:
+        SQL.execute_sql_query_no_results(db, ddl)
     return db
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of up to `rate` calls, then
+    paces callers to `rate` calls per second on average.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        # Reserve the token under the lock (a negative balance queues later callers behind it),
+        # then sleep outside it so waiters don't serialize on the sleeper
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
 def validate_response_or_exception(response: requests.Response, code: int, logger: logging.Logger):
     if response.status_code != code:
         logger.error(f'Problem ulr {response.url} \n {response.status_code}')
@@ -1,11 +1,30 @@
 import base64
-import json
+import functools
 import logging
 import re
 import time
 from typing import Any, Dict, Optional, Union, List
 
-from playwright.sync_api import BrowserContext, Page
+import orjson
+from playwright.sync_api import BrowserContext, Page, Route
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+def _dig(obj: Any, *path: str, default: Any = None) -> Any:
+    """Walk nested dicts by key; `default` as soon as a level is missing or not a dict (no throwaway {} per miss)."""
+    for k in path:
+        if not isinstance(obj, dict):
+            return default
+        obj = obj.get(k)
+        if obj is None:
+            return default
+    return obj
+
+
+# Constants for _normalize_listing_id (built once, not per call)
+_DIGITS_RE = re.compile(r"\d+")
+_ID_PREFIX_RE = re.compile(r"(?:StayListing|DemandStayListing|StayListingProduct|listing):|rooms/")
+_B64_ID_PREFIXES = ("StayListing:", "DemandStayListing:", "StayListingProduct:")
+_B64_ALPHABET = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=")
 
 
 def _normalize_listing_id(raw_id: Any, item: Optional[Dict[str, Any]] = None) -> Optional[str]:
@@ -20,93 +39,109 @@ def _normalize_listing_id(raw_id: Any, item: Optional[Dict[str, Any]] = None) ->
     if isinstance(raw_id, int):
         return str(raw_id)
     if isinstance(raw_id, str):
-        s = raw_id.strip()
-        if s.isdigit():
-            return s
+        # Clean ids are the common case and skip the cache entirely
+        if raw_id.isdigit():
+            return raw_id
+        return _normalize_listing_id_str(raw_id)
+    return None
+
+
+@functools.lru_cache(maxsize=8192)
+def _normalize_listing_id_str(raw_id: str) -> Optional[str]:
+    """String branch of _normalize_listing_id, memoized: the same ids recur across pages and retries."""
+    s = raw_id.strip() if raw_id[:1].isspace() or raw_id[-1:].isspace() else raw_id
+    if s.isdigit():
+        return s
+    if "e+" in s or "E+" in s:
         try:
-            if "e+" in s.lower():
-                return str(int(float(s)))
+            return str(int(float(s)))
         except ValueError:
             pass
-        for prefix in ("StayListing:", "DemandStayListing:", "StayListingProduct:", "listing:", "rooms/"):
-            if prefix in s:
-                tail = s.split(prefix)[-1]
-                digits = re.findall(r"\d+", tail)
-                if digits:
-                    return digits[0]
-        if "/" in s and "rooms" in s:
-            parts = [p for p in s.split("/") if p]
-            for p in reversed(parts):
-                if p.isdigit():
-                    return p
-        if len(s) > 10 and not s.isdigit():
-            try:
-                missing = len(s) % 4
-                if missing:
-                    s += "=" * (4 - missing)
-                decoded = base64.b64decode(s).decode("utf-8", errors="ignore")
-                for prefix in ("StayListing:", "DemandStayListing:", "StayListingProduct:"):
-                    if prefix in decoded:
-                        num = decoded.split(prefix)[-1].split(",")[0].strip()
-                        if num.isdigit():
-                            return num
-                if decoded.strip().isdigit():
-                    return decoded.strip()
-            except Exception:
-                pass
+    m = _ID_PREFIX_RE.search(s)
+    if m:
+        d = _DIGITS_RE.search(s, m.end())
+        if d:
+            return d.group(0)
+    if "/" in s and "rooms" in s:
+        parts = [p for p in s.split("/") if p]
+        for p in reversed(parts):
+            if p.isdigit():
+                return p
+    if len(s) > 10 and not s.isdigit() and _B64_ALPHABET.issuperset(s):
+        try:
+            missing = len(s) % 4
+            if missing:
+                s += "=" * (4 - missing)
+            decoded = base64.b64decode(s).decode("utf-8", errors="ignore")
+            for prefix in _B64_ID_PREFIXES:
+                if prefix in decoded:
+                    num = decoded.split(prefix)[-1].split(",")[0].strip()
+                    if num.isdigit():
+                        return num
+            if decoded.strip().isdigit():
+                return decoded.strip()
+        except Exception:
+            pass
     return None
 
 
+_TRANSLATION_POPUP_SEL = ", ".join([
+    'div[role="dialog"]:has-text("Translation on") button[aria-label="Close"]',
+    'div[role="dialog"]:has-text("Translation") button[aria-label="Close"]',
+    'button:has-text("Got it")',
+    'button:has-text("No thanks")',
+    'button:has-text("Continue in English")',
+    '[data-testid="translation-banner-dismiss"]',
+    '[data-testid="language-detector-decline"]',
+])
+_GENERAL_POPUP_SEL = ", ".join([
+    'div[role="dialog"] button[aria-label="Close"]',
+    '[data-testid="modal-container"] button[aria-label="Close"]',
+    'button[aria-label="Dismiss"]',
+    'button:has-text("Accept all cookies")',
+    'button:has-text("Accept")',
+    'button:has-text("OK")',
+    'button:has-text("Close")',
+])
+# Anything a dismissal pass could act on; nothing matching means there is nothing to do
+_ANY_POPUP_SEL = f'div[role="dialog"], [data-testid="modal-container"], {_TRANSLATION_POPUP_SEL}, {_GENERAL_POPUP_SEL}'
+
+
 def _dismiss_any_popups_enhanced(page: Page, logger: Optional[logging.Logger] = None, max_attempts: int = 3) -> bool:
+    def try_click(selector: str) -> bool:
+        clicked = False
+        for el in page.locator(selector).all()[:16]:
+            try:
+                if el.is_visible():
+                    el.click(timeout=1200, force=True)
+                    try:
+                        page.wait_for_timeout(200)
+                    except Exception:
+                        pass
+                    clicked = True
+            except Exception:
+                continue
+        return clicked
+
     attempts = 0
     while attempts < max_attempts:
         attempts += 1
-        translation_selectors = [
-            'div[role="dialog"]:has-text("Translation on") button[aria-label="Close"]',
-            'div[role="dialog"]:has-text("Translation") button[aria-label="Close"]',
-            'button:has-text("Got it")',
-            'button:has-text("No thanks")',
-            'button:has-text("Continue in English")',
-            '[data-testid="translation-banner-dismiss"]',
-            '[data-testid="language-detector-decline"]',
-        ]
-        general_selectors = [
-            'div[role="dialog"] button[aria-label="Close"]',
-            '[data-testid="modal-container"] button[aria-label="Close"]',
-            'button[aria-label="Dismiss"]',
-            'button:has-text("Accept all cookies")',
-            'button:has-text("Accept")',
-            'button:has-text("OK")',
-            'button:has-text("Close")',
-        ]
 
-        def try_click(selectors: List[str]) -> bool:
-            clicked = False
-            for sel in selectors:
-                try:
-                    els = page.locator(sel)
-                    cnt = min(els.count(), 8)
-                    for i in range(cnt):
-                        el = els.nth(i)
-                        if el.is_visible(timeout=300):
-                            el.click(timeout=1200, force=True)
-                            try:
-                                page.wait_for_timeout(200)
-                            except Exception:
-                                pass
-                            clicked = True
-                except Exception:
-                    continue
-            return clicked
+        # Common case: no popup at all -> one query and out
+        try:
+            if not page.locator(_ANY_POPUP_SEL).count():
+                break
+        except Exception:
+            break
 
         try:
-            did = try_click(translation_selectors) or try_click(general_selectors)
+            did = try_click(_TRANSLATION_POPUP_SEL) or try_click(_GENERAL_POPUP_SEL)
         except Exception:
             break
 
         try:
             # quick escape on any visible dialog
-            if page.locator('div[role="dialog"]').first.is_visible(timeout=200):
+            if page.locator('div[role="dialog"]').first.is_visible():
                 for _ in range(2):
                     page.keyboard.press("Escape")
                     page.wait_for_timeout(120)
@@ -123,12 +158,127 @@ def _dismiss_any_popups_enhanced(page: Page, logger: Optional[logging.Logger] =
     return True
 
 
+_GALLERY_OPEN_SEL = '[data-testid="photo-viewer-section"], div[role="dialog"][aria-label*="Photo"]'
+
+# True once every image intersecting the viewport has a src and has finished loading
+# (lazy-load settled; an img still waiting for its src counts as not loaded)
+_VISIBLE_IMAGES_LOADED_JS = """
+() => Array.from(document.images).every(img => {
+  const r = img.getBoundingClientRect();
+  const inView = r.bottom > 0 && r.top < window.innerHeight && r.width > 0;
+  return !inView || (!!img.getAttribute("src") && img.complete);
+})
+"""
+
+# Neither keyboard.press nor mouse.wheel waits for the scroll to land; give it this long (ms)
+# before checking the new viewport's images
+_SCROLL_SETTLE_MS = 200
+
+# Streams gallery image URLs (junk filtered, query strings dropped) to Python through the
+# __pdpImg binding: everything already in the DOM, then each img added or re-pointed later.
+# The observer lives until the page navigates away.
+_GALLERY_STREAM_JS = """
+() => {
+  const SEL = [
+    '[data-testid="photo-viewer-section"] img',
+    'div[role="dialog"] img',
+    '[data-testid="main-gallery-grid"] img',
+    'img[src*="imagedelivery"]',
+    'picture img',
+  ].join(", ");
+  const junk = new RegExp("/pictures/user/|airbnb-platform-assets|static/packages", "i");
+  const seen = new Set();
+  const emit = el => {
+    const src = (el.getAttribute("src") || "").trim();
+    if (!src || junk.test(src)) return;
+    const u = src.split("?")[0];
+    if (seen.has(u)) return;
+    seen.add(u);
+    window.__pdpImg(u);
+  };
+  document.querySelectorAll(SEL).forEach(emit);
+  new MutationObserver(muts => {
+    for (const m of muts) {
+      if (m.type === "attributes") {
+        if (m.target.matches(SEL)) emit(m.target);
+        continue;
+      }
+      for (const n of m.addedNodes) {
+        if (n.nodeType !== 1) continue;
+        if (n.matches(SEL)) emit(n);
+        n.querySelectorAll(SEL).forEach(emit);
+      }
+    }
+  }).observe(document, {childList: true, subtree: true, attributes: true, attributeFilter: ["src"]});
+}
+"""
+
+# Stop scrolling once no new gallery URL has arrived for this long (s)
+_GALLERY_IDLE_S = 1.5
+
+
+# DOM fallbacks never need fonts, media or analytics; images only matter to the gallery scraper.
+# Stylesheets stay on: both scrapers rely on real layout for visibility checks and scrolling.
+_DOM_BLOCKED_TYPES = frozenset({"font", "media"})
+_DOM_AD_RE = re.compile(r"google-analytics|googletagmanager|doubleclick|segment\.io|hotjar|facebook\.net")
+
+
+def _route_dom_fallback(route: Route, policy: Dict[str, Any]) -> None:
+    req = route.request
+    rtype = req.resource_type
+    if (
+        rtype in _DOM_BLOCKED_TYPES
+        or (rtype == "image" and not policy["images"])
+        or _DOM_AD_RE.search(req.url)
+    ):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _dom_page(context: BrowserContext, images: bool = False, image_sink: Optional[set] = None) -> Page:
+    """Pooled page for this context; `image_sink` receives URLs streamed by _GALLERY_STREAM_JS.
+
+    One warm page per browser context, reused across listings (a closed page is replaced). It is
+    kept on the context object itself, so it goes away with the context instead of piling up.
+    """
+    entry = getattr(context, "_dom_page_entry", None)
+    if entry is None or entry[0].is_closed():
+        page = context.new_page()
+        state: Dict[str, Any] = {"images": images, "sink": image_sink}
+
+        def on_img(url: str) -> None:
+            sink = state["sink"]
+            if sink is not None:
+                sink.add(url)
+
+        page.route("**/*", lambda route: _route_dom_fallback(route, state))
+        page.expose_function("__pdpImg", on_img)
+        entry = context._dom_page_entry = (page, state)
+
+    page, state = entry
+    state["images"] = images
+    state["sink"] = image_sink
+    return page
+
+
+def _release_dom_page(page: Page) -> None:
+    """Park the page on about:blank so the previous PDP stops running; drop it if that fails."""
+    try:
+        page.goto("about:blank")
+    except Exception:
+        try:
+            page.close()
+        except Exception:
+            pass
+
+
 def _scrape_images_from_dom(context: BrowserContext, url: str, logger: logging.Logger, max_imgs: int = 200) -> List[str]:
     """
     Fallback: Open PDP, click 'Show all photos', scrape WHILE scrolling using Keyboard.
     """
-    page = context.new_page()
     collected_urls = set()
+    page = _dom_page(context, images=True, image_sink=collected_urls)
     
     try:
         logger.info(f"[PDP DOM] Opening PDP to collect images: {url}")
@@ -150,8 +300,11 @@ def _scrape_images_from_dom(context: BrowserContext, url: str, logger: logging.L
                     logger.info(f"[PDP DOM] Found gallery button via '{sel}'. Force clicking...")
                     btn.click(timeout=4000, force=True)
                     
-                    # Wait for animation
-                    page.wait_for_timeout(2500)
+                    # Wait for the gallery itself rather than a fixed animation delay
+                    try:
+                        page.wait_for_selector(_GALLERY_OPEN_SEL, timeout=4000)
+                    except PlaywrightTimeoutError:
+                        pass
                     
                     # --- FIX FOR TRANSLATION POPUP ---
                     # Force press Escape to close any overlapping "Translation on" popups
@@ -180,36 +333,11 @@ def _scrape_images_from_dom(context: BrowserContext, url: str, logger: logging.L
             except Exception:
                 pass
 
-        image_selectors = [
-            '[data-testid="photo-viewer-section"] img', 
-            'div[role="dialog"] img',                   
-            '[data-testid="main-gallery-grid"] img',    
-            'img[src*="imagedelivery"]',
-            'picture img',
-        ]
+        # 1. From here on the page pushes every gallery URL into collected_urls as it appears
+        page.evaluate(_GALLERY_STREAM_JS)
+        last_count, last_new = len(collected_urls), time.monotonic()
 
         for i in range(loops):
-            # 1. Scrape what is currently visible
-            try:
-                for sel in image_selectors:
-                    elements = page.locator(sel).all()
-                    for el in elements:
-                        src = el.get_attribute("src")
-                        if not src: continue
-                        
-                        src = src.strip()
-                        lower_src = src.lower()
-
-                        # Filter junk
-                        if "/pictures/user/" in lower_src: continue
-                        if "airbnb-platform-assets" in lower_src: continue
-                        if "static/packages" in lower_src: continue
-
-                        clean_url = src.split("?")[0]
-                        collected_urls.add(clean_url)
-            except Exception:
-                pass
-
             # Stop if we have plenty
             if len(collected_urls) >= max_imgs:
                 break
@@ -225,11 +353,22 @@ def _scrape_images_from_dom(context: BrowserContext, url: str, logger: logging.L
                     # Main page scroll
                     page.mouse.wheel(0, 3000)
                 
-                # Wait for network lazy load
-                page.wait_for_timeout(400)
+                # Wait for network lazy load: let the scroll land, then stop as soon as the
+                # newly visible images have loaded
+                page.wait_for_timeout(_SCROLL_SETTLE_MS)
+                try:
+                    page.wait_for_function(_VISIBLE_IMAGES_LOADED_JS, timeout=400)
+                except PlaywrightTimeoutError:
+                    pass
             except Exception:
                 break
 
+            # Nothing new streamed in for a while: the end of the gallery has been reached
+            if len(collected_urls) != last_count:
+                last_count, last_new = len(collected_urls), time.monotonic()
+            elif time.monotonic() - last_new > _GALLERY_IDLE_S:
+                break
+
         final_list = list(collected_urls)
         logger.info(f"[PDP DOM] Collected {len(final_list)} unique image URLs")
         return final_list
@@ -238,10 +377,7 @@ def _scrape_images_from_dom(context: BrowserContext, url: str, logger: logging.L
         logger.info(f"[PDP DOM] Fallback failed: {e}")
         return []
     finally:
-        try:
-            page.close()
-        except Exception:
-            pass
+        _release_dom_page(page)
 
 def _scrape_details_from_dom(context: BrowserContext, url: str, logger: logging.Logger) -> Dict[str, Any]:
     """
@@ -249,7 +385,7 @@ def _scrape_details_from_dom(context: BrowserContext, url: str, logger: logging.
     1. Tries to parse hidden 'niobeClientData' JSON (FAST & ACCURATE).
     2. Falls back to visual scraping if JSON is missing.
     """
-    page = context.new_page()
+    page = _dom_page(context)
     details: Dict[str, Any] = {
         "title": None,
         "location": None,
@@ -282,7 +418,7 @@ def _scrape_details_from_dom(context: BrowserContext, url: str, logger: logging.
             script_content = page.locator('#data-deferred-state-0').inner_text()
             
             if script_content:
-                json_data = json.loads(script_content)
+                json_data = orjson.loads(script_content)
                 niobe_data = json_data.get("niobeClientData", [])
                 
                 for item in niobe_data:
@@ -290,10 +426,10 @@ def _scrape_details_from_dom(context: BrowserContext, url: str, logger: logging.
                     payload = item[1]
                     if not isinstance(payload, dict): continue
                     
-                    data_root = payload.get("data", {}).get("presentation", {}).get("stayProductDetailPage", {})
+                    data_root = _dig(payload, "data", "presentation", "stayProductDetailPage")
                     if not data_root: continue
                     
-                    sections = data_root.get("sections", {}).get("sections", [])
+                    sections = _dig(data_root, "sections", "sections") or []
                     for sec in sections:
                         sec_data = sec.get("section", {})
                         sec_id = sec.get("sectionId", "")
@@ -321,12 +457,8 @@ def _scrape_details_from_dom(context: BrowserContext, url: str, logger: logging.
                                 target_id_raw = raw_context_uid if raw_context_uid else raw_uid
                                 
                                 if target_id_raw:
-                                    if "User" in target_id_raw and not target_id_raw.isdigit():
-                                        try:
-                                            decoded = base64.b64decode(target_id_raw).decode('utf-8')
-                                            details["userId"] = decoded.split(":")[-1]
-                                        except: 
-                                            details["userId"] = target_id_raw
+                                    if isinstance(target_id_raw, str) and "User" in target_id_raw and not target_id_raw.isdigit():
+                                        details["userId"] = _decode_user_id(target_id_raw)
                                     else:
                                         details["userId"] = target_id_raw
                                         
@@ -400,10 +532,172 @@ def _scrape_details_from_dom(context: BrowserContext, url: str, logger: logging.
         logger.info(f"[PDP DOM] Details fallback completely failed: {e}")
         return details
     finally:
-        try:
-            page.close()
-        except Exception:
-            pass
+        _release_dom_page(page)
+class _PhotoSet:
+    """Ordered, de-duplicated photo URLs; the title picture (if any) is moved to the front by finish()."""
+
+    __slots__ = ("urls", "seen", "primary")
+
+    def __init__(self) -> None:
+        self.urls: List[str] = []
+        self.seen: set = set()
+        self.primary: Optional[str] = None
+
+    def add(self, u: Optional[str]) -> None:
+        if u and u not in self.seen:
+            self.seen.add(u)
+            self.urls.append(u)
+
+    def finish(self) -> List[str]:
+        if self.primary:
+            if self.primary in self.seen:
+                self.urls.remove(self.primary)
+            self.urls.insert(0, self.primary)
+        return self.urls
+
+
+_PLAIN_USER_ID_RE = re.compile(r"User:(\d+)")
+
+
+@functools.lru_cache(maxsize=4096)
+def _decode_user_id(user_id_b64: str) -> str:
+    """Numeric tail of a base64 "User:<digits>" id; only the tail bytes are decoded (memoized per host)."""
+    # Ids that already carry a plain "User:<digits>" need no decoding at all
+    m = _PLAIN_USER_ID_RE.search(user_id_b64)
+    if m:
+        return m.group(1)
+    try:
+        raw = base64.b64decode(user_id_b64)
+        return raw.rpartition(b":")[2].decode("ascii")
+    except Exception:
+        return str(user_id_b64)
+
+
+_JUNK_PHOTO_RE = re.compile(r"/pictures/user/|airbnb-platform-assets|static/packages", re.IGNORECASE)
+
+
+def _clean_photo_url(u: Optional[str]) -> Optional[str]:
+    """URL without its query string, or None for empty/avatar/asset URLs."""
+    if not u:
+        return None
+    clean = u.split("?", 1)[0]
+    if _JUNK_PHOTO_RE.search(clean):
+        return None
+    return clean
+
+
+_PHOTO_URL_FIELDS = ("baseUrl", "url", "originalUrl", "largeUrl", "pictureUrl")
+
+
+def _h_photo_gallery(payload: Dict[str, Any], out: Dict[str, Any], photos: _PhotoSet) -> None:
+    for source in (
+        payload.get("mediaItems", []),
+        payload.get("photos", []),
+        payload.get("images", []),
+        payload.get("galleryItems", []),
+    ):
+        if not source or not isinstance(source, list): continue
+        for item in source:
+            if not item or not isinstance(item, dict): continue
+            photo_url = None
+            for field in _PHOTO_URL_FIELDS:
+                if item.get(field):
+                    photo_url = item[field]
+                    break
+            if not photo_url:
+                picture_obj = item.get("picture", {})
+                if isinstance(picture_obj, dict):
+                    for field in _PHOTO_URL_FIELDS:
+                        if picture_obj.get(field):
+                            photo_url = picture_obj[field]
+                            break
+            if isinstance(photo_url, str):
+                photos.add(photo_url)
+
+
+def _h_title(payload: Dict[str, Any], out: Dict[str, Any], photos: _PhotoSet) -> None:
+    out["title"] = payload.get("title")
+    out["roomTypeCategory"] = payload.get("roomTypeCategory")
+    pic_url = _dig(payload, "shareSave", "embedData", "pictureUrl")
+    if isinstance(pic_url, str) and pic_url: photos.primary = pic_url
+
+
+def _h_availability(payload: Dict[str, Any], out: Dict[str, Any], photos: _PhotoSet) -> None:
+    get = payload.get
+    out["location"] = get("localizedLocation")
+    out["maxGuestCapacity"] = get("maxGuestCapacity", 0)
+
+
+def _h_reviews(payload: Dict[str, Any], out: Dict[str, Any], photos: _PhotoSet) -> None:
+    get = payload.get
+    out["isGuestFavorite"] = bool(get("isGuestFavorite"))
+    out["reviewsCount"] = get("overallCount", 0)
+    out["averageRating"] = get("overallRating", 0.0)
+
+
+def _h_location(payload: Dict[str, Any], out: Dict[str, Any], photos: _PhotoSet) -> None:
+    get = payload.get
+    out["lat"] = get("lat")
+    out["lng"] = get("lng")
+
+
+def _h_meet_your_host(payload: Dict[str, Any], out: Dict[str, Any], photos: _PhotoSet) -> None:
+    card = payload.get("cardData")
+    if not isinstance(card, dict):
+        return
+    card_get = card.get
+    out["host"] = card_get("name")
+    out["isSuperhost"] = bool(card_get("isSuperhost"))
+    out["isVerified"] = bool(card_get("isVerified"))
+    out["ratingCount"] = card_get("ratingCount", 0)
+
+    for key in ("about", "description", "bio", "hostBio", "hostDescription"):
+        val = card_get(key)
+        if isinstance(val, str):
+            val = val.strip()
+            if len(val) >= 40:
+                out["hostAboutText"] = val
+                break
+
+    user_id_b64 = card_get("userId")
+    if user_id_b64:
+        out["userId"] = _decode_user_id(user_id_b64) if isinstance(user_id_b64, str) else str(user_id_b64)
+    user_id = out["userId"]
+    if user_id:
+        out["userUrl"] = f"https://www.airbnb.com/users/show/{user_id}"
+
+    time_as_host = card_get("timeAsHost")
+    if not isinstance(time_as_host, dict):
+        time_as_host = {}
+    out["years"] = time_as_host.get("years", 0)
+    out["months"] = time_as_host.get("months", 0)
+    out["hostrAtingAverage"] = card_get("ratingAverage", 0.0)
+
+
+# PDP sectionId -> handler(payload, out, photos); galleries are matched by substring instead.
+# Handlers only read dict payloads (the caller checks) and guard nested values themselves,
+# so dispatch needs no per-section try block.
+_SECTION_HANDLERS = {
+    "TITLE_DEFAULT": _h_title,
+    "AVAILABILITY_CALENDAR_DEFAULT": _h_availability,
+    "REVIEWS_DEFAULT": _h_reviews,
+    "LOCATION_DEFAULT": _h_location,
+    "MEET_YOUR_HOST": _h_meet_your_host,
+}
+
+
+@functools.lru_cache(maxsize=8192)
+def _b64_stay_listing(listing_id: str) -> str:
+    """GraphQL node id for a listing (base64 of "StayListing:<id>"), reused across retries."""
+    return base64.b64encode(f"StayListing:{listing_id}".encode("utf-8")).decode("utf-8")
+
+
+@functools.lru_cache(maxsize=64)
+def _extensions_json(token: str) -> bytes:
+    """Encoded persisted-query extensions; fully determined by the PDP token."""
+    return orjson.dumps({"persistedQuery": {"version": 1, "sha256Hash": token}})
+
+
 def scrape_single_result(
     context: BrowserContext,
     item_search_token: str,
@@ -421,9 +715,9 @@ def scrape_single_result(
     if not _id:
         raise ValueError(f"listing_info.id is not numeric: {listing_info.get('id')!r}")
 
-    logger.info(f"=> Hydrating listing {_id} | {listing_info.get('link')}")
+    logger.info("=> Hydrating listing %s | %s", _id, listing_info.get("link"))
     url = f"https://www.airbnb.com/api/v3/StaysPdpSections/{item_search_token}"
-    item_id = base64.b64encode(f"StayListing:{_id}".encode("utf-8")).decode("utf-8")
+    item_id = _b64_stay_listing(_id)
     variables = {
         "id": item_id,
         "useContextualUser": False,
@@ -441,14 +735,12 @@ def scrape_single_result(
             "p3ImpressionId": f"p3_{int(time.time())}_P3lbdkkYZMTFJexg",
         },
     }
-    extensions = {"persistedQuery": {"version": 1, "sha256Hash": item_search_token}}
 
-    # Build headers
+    # Build headers: caller's session headers, then PDP defaults for anything missing
     headers = dict(base_headers or {})
     headers.setdefault("accept", "application/json, text/plain, */*")
     headers.setdefault("accept-language", "en-US,en;q=0.9")
     headers.setdefault("origin", "https://www.airbnb.com")
-    headers.setdefault("referer", listing_info.get("link", "https://www.airbnb.com/"))
     headers.setdefault("x-airbnb-graphql-platform", "web")
     headers.setdefault("x-airbnb-graphql-platform-client", "web")
     headers.setdefault("content-type", "application/json")
@@ -458,6 +750,7 @@ def scrape_single_result(
         headers.setdefault("x-client-version", client_version)
     if client_request_id:
         headers.setdefault("x-client-request-id", client_request_id)
+    headers.setdefault("referer", listing_info.get("link", "https://www.airbnb.com/"))
 
     # Default output structure
     out: Dict[str, Any] = {
@@ -489,190 +782,112 @@ def scrape_single_result(
 
     # ---- 1. Try GraphQL POST ----
     try:
-        resp = context.request.post(url=url, headers=headers, data=json.dumps({
-            "operationName": "StaysPdpSections",
-            "variables": variables,
-            "extensions": extensions,
-        }), timeout=30000)
+        # Body spliced from pre-encoded parts: only the per-listing variables are encoded here
+        body = (
+            b'{"operationName":"StaysPdpSections","variables":'
+            + orjson.dumps(variables)
+            + b',"extensions":'
+            + _extensions_json(item_search_token)
+            + b"}"
+        )
+        resp = context.request.post(url=url, headers=headers, data=body, timeout=30000)
 
         if resp.status == 200:
             try:
-                data = resp.json()
+                data = orjson.loads(resp.body())
             except Exception:
                 data = None
             
-            if data and not data.get("errors"):
-                root = (((data.get("data") or {}).get("presentation") or {}).get("stayProductDetailPage") or {})
+            # Decided by payload structure: partial GraphQL errors still come with usable data
+            root = _dig(data, "data", "presentation", "stayProductDetailPage")
+            if isinstance(data, dict) and data.get("errors"):
                 if root:
-                    out["productType"] = root.get("productType") or ""
-                    out["__typename"] = root.get("__typename") or ""
-                    out["pdpType"] = root.get("pdpType") or ""
-
-                    # Photos from root
-                    all_photos: List[str] = []
-                    initial_urls = [(p or {}).get("url") for p in (root.get("photos") or []) if p and p.get("url")]
-                    if initial_urls:
-                        all_photos.extend(initial_urls)
-                        logger.info(f"Found {len(initial_urls)} photos from root.photos")
-
-                    # Luxe detection
-                    ptype = (root.get("productType") or "").upper()
-                    tname = (root.get("__typename") or "").upper()
-                    pdp = (root.get("pdpType") or "").upper()
-                    out["airbnbLuxe"] = bool(ptype == "LUXE" or pdp == "LUXE" or ("LUXE" in tname))
-
-                    # Sections
-                    section_list = ((root.get("sections") or {}).get("sections")) or []
-                    for sec in section_list:
-                        if not isinstance(sec, dict):
-                            continue
-                        try:
-                            sid = (sec.get("sectionId") or "")
-                            payload = sec.get("section") or {}
-
-                            if sid and ("PHOTOGALLERY" in sid or "PHOTO" in sid):
-                                try:
-                                    photo_sources = [
-                                        payload.get("mediaItems", []),
-                                        payload.get("photos", []),
-                                        payload.get("images", []),
-                                        payload.get("galleryItems", []),
-                                    ]
-                                    for source in photo_sources:
-                                        if not source: continue
-                                        for item in source:
-                                            if not item or not isinstance(item, dict): continue
-                                            photo_url = None
-                                            url_fields = ["baseUrl", "url", "originalUrl", "largeUrl", "pictureUrl"]
-                                            for field in url_fields:
-                                                if item.get(field):
-                                                    photo_url = item[field]
-                                                    break
-                                            if not photo_url:
-                                                picture_obj = item.get("picture", {})
-                                                if isinstance(picture_obj, dict):
-                                                    for field in url_fields:
-                                                        if picture_obj.get(field):
-                                                            photo_url = picture_obj[field]
-                                                            break
-                                            if photo_url:
-                                                all_photos.append(photo_url)
-                                except Exception as e:
-                                    logger.warning(f"Could not parse photo gallery section {sid}: {e}")
-
-                            elif sid == "TITLE_DEFAULT":
-                                out["title"] = payload.get("title")
-                                out["roomTypeCategory"] = payload.get("roomTypeCategory")
-                                try:
-                                    pic_url = payload.get("shareSave", {}).get("embedData", {}).get("pictureUrl")
-                                    if pic_url: all_photos.insert(0, pic_url)
-                                except: pass
-
-                            elif sid == "AVAILABILITY_CALENDAR_DEFAULT":
-                                out["location"] = payload.get("localizedLocation")
-                                out["maxGuestCapacity"] = payload.get("maxGuestCapacity", 0)
-
-                            elif sid == "REVIEWS_DEFAULT":
-                                out["isGuestFavorite"] = bool(payload.get("isGuestFavorite"))
-                                out["reviewsCount"] = payload.get("overallCount", 0)
-                                out["averageRating"] = payload.get("overallRating", 0.0)
-
-                            elif sid == "LOCATION_DEFAULT":
-                                out["lat"] = payload.get("lat")
-                                out["lng"] = payload.get("lng")
-
-                            elif sid == "MEET_YOUR_HOST":
-                                card = payload.get("cardData") or {}
-                                out["host"] = card.get("name")
-                                out["isSuperhost"] = bool(card.get("isSuperhost"))
-                                out["isVerified"] = bool(card.get("isVerified"))
-                                out["ratingCount"] = card.get("ratingCount", 0)
-
-                                for key in ("about", "description", "bio", "hostBio", "hostDescription"):
-                                    val = card.get(key)
-                                    if isinstance(val, str) and len(val.strip()) >= 40:
-                                        out["hostAboutText"] = val.strip()
-                                        break
-
-                                user_id_b64 = card.get("userId")
-                                if user_id_b64:
-                                    try:
-                                        out["userId"] = base64.b64decode(user_id_b64.encode("utf-8")).decode("utf-8").split(":")[-1]
-                                    except:
-                                        out["userId"] = str(user_id_b64)
-                                if out["userId"]:
-                                    out["userUrl"] = f"https://www.airbnb.com/users/show/{out['userId']}"
-
-                                time_as_host = card.get("timeAsHost") or {}
-                                out["years"] = time_as_host.get("years", 0)
-                                out["months"] = time_as_host.get("months", 0)
-                                out["hostrAtingAverage"] = card.get("ratingAverage", 0.0)
-                        except Exception:
-                            continue
-
-                    # Success! Process photos and return
-                    unique_photos = list(dict.fromkeys([u for u in all_photos if u]))
-                    out["allPictures"] = unique_photos
-                    if unique_photos:
-                        out["picture"] = unique_photos[0]
-
-                    logger.info(f"Final photo count for {_id}: {len(unique_photos)} unique photos")
+                    logger.warning("[PDP] GraphQL errors alongside data for %s; using the data", _id)
+                else:
+                    logger.error("[PDP] GraphQL errors")
+            if isinstance(root, dict) and root:
+                out["productType"] = root.get("productType") or ""
+                out["__typename"] = root.get("__typename") or ""
+                out["pdpType"] = root.get("pdpType") or ""
+
+                # Photos from root
+                photos = _PhotoSet()
+                n_root = 0
+                for p in root.get("photos") or ():
+                    u = p.get("url") if p else None
+                    if u:
+                        photos.add(u)
+                        n_root += 1
+                if n_root:
+                    logger.info("Found %d photos from root.photos", n_root)
+
+                # Luxe detection
+                ptype = (root.get("productType") or "").upper()
+                tname = (root.get("__typename") or "").upper()
+                pdp = (root.get("pdpType") or "").upper()
+                out["airbnbLuxe"] = bool(ptype == "LUXE" or pdp == "LUXE" or ("LUXE" in tname))
+
+                # Sections: photo galleries by substring, everything else by exact sectionId
+                section_list = _dig(root, "sections", "sections") or []
+                for sec in section_list:
+                    if not isinstance(sec, dict):
+                        continue
+                    sid = sec.get("sectionId") or ""
+                    if not isinstance(sid, str):
+                        continue
+                    payload = sec.get("section")
+                    if not isinstance(payload, dict):
+                        continue
+                    if "PHOTO" in sid:
+                        _h_photo_gallery(payload, out, photos)
+                        continue
+                    handler = _SECTION_HANDLERS.get(sid)
+                    if handler is not None:
+                        handler(payload, out, photos)
+
+                # Success unless the payload had nothing usable: only then is the DOM worth a page load
+                unique_photos = photos.finish()
+                out["allPictures"] = unique_photos
+                if unique_photos:
+                    out["picture"] = unique_photos[0]
+
+                if out["title"] or out["host"] or unique_photos:
+                    logger.info("Final photo count for %s: %d unique photos", _id, len(unique_photos))
                     return out
-            else:
-                logger.error(f"[PDP] GraphQL errors")
+                logger.info("[PDP] GraphQL payload for %s has no title, host or photos", _id)
         else:
-            logger.error(f"[PDP] HTTP {resp.status}")
+            logger.error("[PDP] HTTP %s %s", resp.status, resp.body()[:300].decode("utf-8", "replace"))
 
     except Exception as e:
-        logger.error(f"[PDP] Request failed: {e}")
+        logger.error("[PDP] Request failed: %s", e)
 
     # ---- 2. Fallback: Scrape details + images from DOM ----
-    logger.info(f"[PDP] Falling back to DOM scraping for {_id}")
+    logger.info("[PDP] Falling back to DOM scraping for %s", _id)
     dom_details = _scrape_details_from_dom(context, listing_info.get("link", ""), logger)
     
+    # Photos are cleaned, junk-filtered and de-duplicated as they are collected (single pass)
+    fallback_photos = _PhotoSet()
     if dom_details:
         # Merge details
         for k, v in dom_details.items():
-            if v not in (None, "", []):
+            if k != "allPictures" and v not in (None, "", []):
                 out[k] = v
-        
-        # Merge images extracted from JSON
-        if dom_details.get("allPictures"):
-            out["allPictures"].extend(dom_details["allPictures"])
-            out["allPictures"] = list(dict.fromkeys(out["allPictures"])) # Dedup immediately
+        for u in dom_details.get("allPictures") or ():
+            fallback_photos.add(_clean_photo_url(u))
 
     # ---- 3. Last Resort: Visual Scrolling ----
     # ONLY run if we found NO images in the JSON to save time
-    if not out["allPictures"]:
+    if not fallback_photos.urls:
         logger.info("[PDP DOM] No images found in JSON, running slow visual scraper...")
-        photos = _scrape_images_from_dom(context, listing_info.get("link", ""), logger)
-        if photos:
-            out["allPictures"].extend(photos)
-
-    # ---- 4. Final Cleanup & Dedup ----
-    clean_photos = []
-    seen_urls = set()
-    combined = out.get("allPictures") or []
-    
-    for p in combined:
-        if not p: continue
-        p_clean = p.split("?")[0] 
-        lower_p = p_clean.lower()
-        
-        # Filter junk
-        if "/pictures/user/" in lower_p: continue
-        if "airbnb-platform-assets" in lower_p: continue
-        if "static/packages" in lower_p: continue
-        
-        if p_clean not in seen_urls:
-            clean_photos.append(p_clean)
-            seen_urls.add(p_clean)
+        for u in _scrape_images_from_dom(context, listing_info.get("link", ""), logger):
+            fallback_photos.add(_clean_photo_url(u))
 
+    clean_photos = fallback_photos.urls
     out["allPictures"] = clean_photos
     if clean_photos:
         out["picture"] = clean_photos[0]
 
-    logger.info(f"Fallback photo count for {_id}: {len(clean_photos)}")
+    logger.info("Fallback photo count for %s: %d", _id, len(clean_photos))
     return out
 
     
@@ -1,50 +1,93 @@
 
 from playwright.sync_api import Page
-from math import sqrt, atan2, cos, sin
+from functools import lru_cache
+from math import hypot
+import os
 import time
 import random
 
+import numpy as np
+
+# Shared generator for trajectory jitter (one per process, no per-call seeding)
+_RNG = np.random.default_rng()
+
+
+def _reseed_rng() -> None:
+    global _RNG
+    _RNG = np.random.default_rng()
+
+
+# Forked workers (multiprocessing.Pool) inherit the parent's generator state: `random` reseeds
+# itself after fork, a NumPy Generator does not, so every worker would draw the same paths
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_rng)
+
+# Shorter waits are coalesced: they cost a nanosleep each but are below timer resolution anyway
+_MIN_SLEEP_S = 0.005
+
+
+@lru_cache(maxsize=512)
+def _bernstein_basis(n: int) -> np.ndarray:
+    """Cubic Bernstein weights at n + 1 evenly spaced t, shape (n + 1, 4); read-only, shared per step count."""
+    t = np.linspace(0.0, 1.0, n + 1)
+    mt = 1.0 - t
+    basis = np.stack([mt ** 3, 3 * mt * mt * t, 3 * mt * t * t, t ** 3], axis=1)
+    basis.setflags(write=False)
+    return basis
+
+
+def _sample_curve(start: tuple, end: tuple, control1: tuple, control2: tuple, n: int) -> np.ndarray:
+    """n + 1 points of the cubic Bezier in one matmul, each with +/-0.6 px micro-jitter; shape (n + 1, 2)."""
+    points = np.array([start, control1, control2, end], dtype=float)
+    return _bernstein_basis(n) @ points + _RNG.uniform(-0.6, 0.6, (n + 1, 2))
+
 class HumanMouseMovement:
     def __init__(self, page: Page):
         self.page = page
-        # Start near viewport center (more human than (0,0))
-        vp = page.viewport_size or {"width": 1280, "height": 800}
-        cx = int(vp["width"] * 0.5 + random.uniform(-20, 20))
-        cy = int(vp["height"] * 0.5 + random.uniform(-20, 20))
-        try:
-            # Try to read any previously stored coords, fallback to center
-            pos = page.evaluate("""() => ({ x: Math.round(window.mouseX || 0), y: Math.round(window.mouseY || 0) })""")
-            x = int(pos.get("x", cx))
-            y = int(pos.get("y", cy))
-        except Exception:
+        # Where an earlier instance left the cursor on this page; probe the page only if unknown
+        last = getattr(page, "_last_mouse", None)
+        if last is not None:
+            x, y = last
+        else:
+            # Start near viewport center (more human than (0,0)); viewport read once per page
+            vp = getattr(page, "_cached_vp", None) or page.viewport_size or {"width": 1280, "height": 800}
+            page._cached_vp = vp
+            cx = int(vp["width"] * 0.5 + random.uniform(-20, 20))
+            cy = int(vp["height"] * 0.5 + random.uniform(-20, 20))
             x, y = cx, cy
+            if page.url != "about:blank":
+                try:
+                    # Try to read any previously stored coords, fallback to center
+                    pos = page.evaluate("""() => ({ x: Math.round(window.mouseX || 0), y: Math.round(window.mouseY || 0) })""")
+                    x = int(pos.get("x", cx))
+                    y = int(pos.get("y", cy))
+                except Exception:
+                    x, y = cx, cy
         self.previous_x = x
         self.previous_y = y
         # Move cursor once to set a known starting position
         try:
             self.page.mouse.move(self.previous_x, self.previous_y)
+            page._last_mouse = (x, y)
         except Exception:
             pass
 
-    def _bezier_curve(self, start: tuple, end: tuple, control1: tuple, control2: tuple, t: float) -> tuple:
-        x = (1 - t) ** 3 * start[0] + 3 * (1 - t) ** 2 * t * control1[0] + 3 * (1 - t) * t ** 2 * control2[0] + t ** 3 * end[0]
-        y = (1 - t) ** 3 * start[1] + 3 * (1 - t) ** 2 * t * control1[1] + 3 * (1 - t) * t ** 2 * control2[1] + t ** 3 * end[1]
-        return (x, y)
-
     def _generate_control_points(self, start: tuple, end: tuple) -> tuple:
         # Bias control points along the segment with a small perpendicular jitter
         dx, dy = end[0] - start[0], end[1] - start[1]
-        dist = max(1.0, sqrt(dx*dx + dy*dy))
-        ang = atan2(dy, dx)
+        dist = hypot(dx, dy) or 1.0
+        inv = 1.0 / dist
+        # One batched draw: two along-segment fractions, two perpendicular signs/magnitudes
+        r1, r2, s1, s2 = _RNG.random(4).tolist()
         # Along-segment offsets
-        a1 = random.uniform(0.2, 0.5) * dist
-        a2 = random.uniform(0.5, 0.8) * dist
+        a1 = (0.2 + 0.3 * r1) * dist
+        a2 = (0.5 + 0.3 * r2) * dist
         # Perpendicular jitter
         jitter = max(6.0, min(dist * 0.15, 60.0))
-        pjit1 = random.uniform(-jitter, jitter)
-        pjit2 = random.uniform(-jitter, jitter)
-        # Unit vectors
-        ux, uy = cos(ang), sin(ang)
+        pjit1 = jitter * (2.0 * s1 - 1.0)
+        pjit2 = jitter * (2.0 * s2 - 1.0)
+        # Unit vectors straight from the delta (no angle round-trip)
+        ux, uy = dx * inv, dy * inv
         px, py = -uy, ux
         control1 = (start[0] + ux * a1 + px * pjit1, start[1] + uy * a1 + py * pjit1)
         control2 = (start[0] + ux * a2 + px * pjit2, start[1] + uy * a2 + py * pjit2)
@@ -61,11 +104,12 @@ class HumanMouseMovement:
     def move_to(self, target_x: int, target_y: int, duration: float = None):
         start = (float(self.previous_x), float(self.previous_y))
         end = (float(target_x), float(target_y))
-        dist = sqrt((end[0] - start[0]) ** 2 + (end[1] - start[1]) ** 2)
+        dist = hypot(end[0] - start[0], end[1] - start[1])
 
         if dist < 4:
             self.page.mouse.move(int(end[0]), int(end[1]))
             self.previous_x, self.previous_y = int(end[0]), int(end[1])
+            self.page._last_mouse = (self.previous_x, self.previous_y)
             return
 
         c1, c2 = self._generate_control_points(start, end)
@@ -75,25 +119,38 @@ class HumanMouseMovement:
             duration = random.uniform(0.35, 0.6) + min(0.8, dist / 900.0)
         delay = duration / steps
 
+        # Whole trajectory (with micro-jitter) and per-step timing computed up front
+        path = _sample_curve(start, end, c1, c2, steps).astype(np.int64)
+        delays = delay * _RNG.uniform(0.85, 1.2, steps + 1)
+
         # small random pauses to mimic hesitation
         pause_every = random.randint(12, 20)
-        for i in range(steps + 1):
-            t = i / steps
-            # vary timing
-            jitter = random.uniform(0.85, 1.2)
-            dt = delay * jitter
-            x, y = self._bezier_curve(start, end, c1, c2, t)
-            # micro-jitter to avoid perfectly smooth curve
-            x += random.uniform(-0.6, 0.6)
-            y += random.uniform(-0.6, 0.6)
-            self.page.mouse.move(int(x), int(y))
+        hes = np.arange(pause_every, steps, pause_every)
+        delays[hes] *= _RNG.uniform(1.5, 2.2, hes.size)
+
+        # Pace against absolute deadlines so each mouse.move round-trip is absorbed
+        # into the step's delay instead of adding to it
+        t0 = time.monotonic()
+        deadlines = t0 + np.cumsum(delays)
+
+        # Only dispatch when the integer pixel changes; a retained point holds until the
+        # deadline of the last duplicate after it, so the overall pacing is unchanged
+        keep = np.empty(len(path), dtype=bool)
+        keep[0] = path[0, 0] != int(self.previous_x) or path[0, 1] != int(self.previous_y)
+        keep[1:] = np.any(path[1:] != path[:-1], axis=1)
+        idx = np.flatnonzero(keep)
+        holds = deadlines[np.append(idx[1:] - 1, len(path) - 1)].tolist()
+        for (x, y), deadline in zip(path[idx].tolist(), holds):
+            self.page.mouse.move(x, y)
             self.previous_x, self.previous_y = x, y
-
-            # occasional tiny pause
-            if i % pause_every == 0 and 0 < i < steps:
-                time.sleep(dt * random.uniform(1.5, 2.2))
-            else:
-                time.sleep(dt)
+            # sub-5 ms slack is left to accumulate into the next step's deadline
+            remaining = deadline - time.monotonic()
+            if remaining >= _MIN_SLEEP_S:
+                time.sleep(remaining)
+        self.page._last_mouse = (int(self.previous_x), int(self.previous_y))
+        remaining = float(deadlines[-1]) - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
 
     def click(self, x: int = None, y: int = None, button: str = "left", delay: float = None):
         if x is not None and y is not None:
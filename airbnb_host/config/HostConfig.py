@@ -36,6 +36,12 @@ BOUNDARIES_PER_SCRAPING = 20
 MAX_LISTINGS_PER_RUN = 3
 DETAIL_SCRAPE_LIMIT = 3
 
+# Nombre de processus (un navigateur chacun) quand plusieurs hôtes sont scrapés
+HOST_MAX_CONCURRENCY = 3
+
+# Débit maximal de requêtes PDP (requêtes / seconde), partagé par tous les processus
+HOST_PDP_RATE = 1.5
+
 
 # How long before we rescrape the same stuff
 UPDATE_WINDOW_DAYS_BOUNDARY = 30
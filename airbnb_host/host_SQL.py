@@ -534,6 +534,7 @@ def insert_new_listing(db: sqlite3.Connection, data: dict):
     """
     db.cursor().execute(query, data)
     db.commit()
+    _fresh_listing_ids.add(str(data["ListingId"]))
 
 def insert_basic_listing(db: sqlite3.Connection, data: dict):
     now_ts = int(datetime.datetime.now().timestamp())
@@ -568,6 +569,7 @@ def insert_basic_listing(db: sqlite3.Connection, data: dict):
     """
     db.cursor().execute(query, data)
     db.commit()
+    _fresh_listing_ids.add(str(data["ListingId"]))
 
 def update_listing_with_details(db: sqlite3.Connection, listing_id: str, detail_data: dict):
     """
@@ -620,7 +622,16 @@ def update_listing_with_details(db: sqlite3.Connection, listing_id: str, detail_
     db.cursor().execute(query, detail_data)
     db.commit()
 
+# Listing ids known to be fresh (scraped inside the update window) in this process.
+# Only positive answers are remembered: a listing that exists stays fresh for the
+# whole run, while a missing one may be inserted at any moment.
+_fresh_listing_ids: set = set()
+
+
 def check_if_listing_exists(db: sqlite3.Connection, listing_id: str) -> bool:
+    listing_id = str(listing_id)
+    if listing_id in _fresh_listing_ids:
+        return True
     now = datetime.datetime.now()
     start_time = int((now - datetime.timedelta(days=HostConfig.UPDATE_WINDOW_DAYS_LISTING)).timestamp())
     cur = db.cursor()
@@ -628,7 +639,28 @@ def check_if_listing_exists(db: sqlite3.Connection, listing_id: str) -> bool:
         "SELECT 1 FROM listing_tracking WHERE ListingId=? AND scraping_time>=? LIMIT 1",
         (listing_id, start_time),
     )
-    return cur.fetchone() is not None
+    if cur.fetchone() is None:
+        return False
+    _fresh_listing_ids.add(listing_id)
+    return True
+
+def fresh_listing_ids(db: sqlite3.Connection, listing_ids: Iterable[str]) -> set:
+    """Subset of listing_ids scraped inside the update window, fetched with batched IN queries."""
+    ids = [str(i) for i in listing_ids]
+    now = datetime.datetime.now()
+    start_time = int((now - datetime.timedelta(days=HostConfig.UPDATE_WINDOW_DAYS_LISTING)).timestamp())
+    found: set = set()
+    cur = db.cursor()
+    # Stay under SQLite's default bound-parameter limit
+    for k in range(0, len(ids), 900):
+        chunk = ids[k:k + 900]
+        cur.execute(
+            f"SELECT ListingId FROM listing_tracking WHERE scraping_time>=? AND ListingId IN ({','.join('?' * len(chunk))})",
+            (start_time, *chunk),
+        )
+        found.update(r[0] for r in cur.fetchall())
+    _fresh_listing_ids.update(found)
+    return found
 
 # -----------------------------
 # Host profile + child writers
@@ -690,21 +722,25 @@ def upsert_host_profile(db: sqlite3.Connection, data: Dict[str, Any]):
     db.commit()
 
 
-def replace_host_listings(db, user_id: str, items: Iterable[Dict[str, Any]]):
+def replace_host_listings(db, user_id: str, items: Iterable[Dict[str, Any]], host_name: Optional[str] = None):
     init_all_tables(db)
     cur = db.cursor()
 
-    # Get host name once
-    cur.execute("SELECT name FROM host_tracking WHERE userId=?", (user_id,))
-    row = cur.fetchone()
-    host_name = row[0] if row else None
-
-    cur.execute("DELETE FROM host_listings WHERE userId=?", (user_id,))
-    cur.executemany(
-        "INSERT OR REPLACE INTO host_listings (userId, name, listingId, listingUrl) VALUES (?, ?, ?, ?)",
-        [(user_id, host_name, str(i.get("listingId")), i.get("listingUrl")) for i in items if i.get("listingId")],
-    )
-    db.commit()
+    # Name from the caller's current scrape; otherwise whatever host_tracking already has
+    if not host_name:
+        cur.execute("SELECT name FROM host_tracking WHERE userId=?", (user_id,))
+        row = cur.fetchone()
+        host_name = row[0] if row else None
+
+    rows = [(user_id, host_name, str(i.get("listingId")), i.get("listingUrl")) for i in items if i.get("listingId")]
+
+    # One transaction: the old set is never left half-replaced if the insert fails
+    with db:
+        db.execute("DELETE FROM host_listings WHERE userId=?", (user_id,))
+        db.executemany(
+            "INSERT OR REPLACE INTO host_listings (userId, name, listingId, listingUrl) VALUES (?, ?, ?, ?)",
+            rows,
+        )
 
 
 
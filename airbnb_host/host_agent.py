@@ -5,11 +5,13 @@ import json
 import urllib.parse
 import logging
 import random
+import contextlib
+import multiprocessing
 from datetime import datetime, timedelta
-from typing import List, Optional, Set, Dict, Union, Any
+from typing import List, Optional, Dict, Union, Any
 
 from playwright.sync_api import (
-    sync_playwright, Page, BrowserContext, Browser, Route, Request, Locator
+    sync_playwright, Page, BrowserContext, Browser, Playwright, Route, Request, Locator
 )
 from undetected_playwright import Tarnished
 
@@ -31,6 +33,13 @@ def _safe_profile_payload(base: dict, ab: dict) -> dict:
     return out
 
 
+def _merge_profile(acc: dict, update: dict) -> None:
+    """Fold a partial host profile into the accumulator; empty values never overwrite known ones."""
+    for k, v in update.items():
+        if v not in (None, ""):
+            acc[k] = v
+
+
 def _classify_listing(dd: dict) -> str:
     """
     Decide ListingObjType using whatever fields we already collect.
@@ -209,16 +218,6 @@ def _parse_user_id_from_url(host_url: str) -> Optional[str]:
         return None
 
 
-def _dedupe_keep_order(items: List[str]) -> List[str]:
-    seen: Set[str] = set()
-    out: List[str] = []
-    for it in items:
-        if it not in seen:
-            out.append(it)
-            seen.add(it)
-    return out
-
-
 def _click_if_exists(search_root, selectors, logger, label):
     for sel in selectors:
         try:
@@ -311,18 +310,26 @@ def _open_all_listings_and_expand(page: Page, logger: logging.Logger) -> None:
             break
 
 
-def _collect_room_links_from_dom(page: Page, logger: logging.Logger, max_scrolls: int = 60) -> List[str]:
-    all_links, last_len = [], 0
+_ROOM_IDS_JS = """
+() => {
+  const ids = [];
+  for (const a of document.querySelectorAll('a[href*="/rooms/"]')) {
+    const m = a.href.match(/\\/rooms\\/(\\d+)/);
+    if (m) ids.push(m[1]);
+  }
+  return ids;
+}
+"""
+
+
+def _collect_room_items_from_dom(page: Page, logger: logging.Logger, max_scrolls: int = 60) -> List[Dict[str, str]]:
+    """Scroll the host page and return unique {listingId, listingUrl} items, in page order."""
+    seen: Dict[str, None] = {}
+    last_len = 0
     for i in range(max_scrolls):
         try:
-            anchors = page.locator('a[href*="/rooms/"]')
-            count = anchors.count()
-            for idx in range(min(count, 800)):
-                href = anchors.nth(idx).get_attribute("href") or ""
-                if "/rooms/" in href:
-                    if href.startswith("/"):
-                        href = "https://www.airbnb.com" + href
-                    all_links.append(href.split("?")[0])
+            for _id in page.evaluate(_ROOM_IDS_JS) or []:
+                seen.setdefault(_id)
         except Exception:
             pass
         try:
@@ -330,12 +337,38 @@ def _collect_room_links_from_dom(page: Page, logger: logging.Logger, max_scrolls
         except Exception:
             break
         time.sleep(random.uniform(0.25, 0.45))
-        if len(all_links) == last_len and i > 10:
+        if len(seen) == last_len and i > 10:
             break
-        last_len = len(all_links)
-    deduped = _dedupe_keep_order(all_links)
-    logger.info(f"[host] Collected {len(deduped)} unique room links from DOM after {i+1} scrolls")
-    return deduped
+        last_len = len(seen)
+    logger.info(f"[host] Collected {len(seen)} unique room links from DOM after {i+1} scrolls")
+    return [{"listingId": _id, "listingUrl": f"https://www.airbnb.com/rooms/{_id}"} for _id in seen]
+
+def _open_pdp_in_background(context: BrowserContext, page: Page, logger: logging.Logger) -> Optional[Page]:
+    """
+    Start loading the first listing visible on the host page in a second tab.
+    Its StaysPdpSections call (which carries the PDP token) then fires while the
+    profile is still being parsed, instead of after it.
+    """
+    try:
+        ids = page.evaluate(_ROOM_IDS_JS) or []
+    except Exception:
+        ids = []
+    if not ids:
+        return None
+    bg = context.new_page()
+    try:
+        bg.goto(f"https://www.airbnb.com/rooms/{ids[0]}", wait_until="commit", timeout=30000)
+        page.bring_to_front()
+        logger.info(f"[pdp-capture] Preloading PDP {ids[0]} in background")
+        return bg
+    except Exception as e:
+        logger.info(f"[pdp-capture] background preload failed: {e}")
+        try:
+            bg.close()
+        except Exception:
+            pass
+        return None
+
 
 def _expand_about_block(about_root: Locator, logger: logging.Logger) -> bool:
     """
@@ -911,12 +944,14 @@ def _extract_host_reviews_tab_or_modal(page: Page, logger: logging.Logger, max_k
             if main:
                 text_parts.append(main)
         else:
-            candidates = b.locator(':is([data-testid="review-text"], blockquote, q, p, div[lang] span)').all()
-            for node in candidates[:8]:
-                try:
-                    t = (node.inner_text(timeout=400) or "").strip()
-                except Exception:
-                    t = ""
+            # All candidate texts in one round-trip instead of an inner_text() call per node
+            try:
+                candidates = b.locator(':is([data-testid="review-text"], blockquote, q, p, div[lang] span)').evaluate_all(
+                    'els => els.slice(0, 8).map(e => (e.innerText || "").trim())'
+                )
+            except Exception:
+                candidates = []
+            for t in candidates:
                 if not t:
                     continue
                 # Skip obvious noise
@@ -1073,6 +1108,13 @@ MONTHS = "|".join(
         "Jan", "Feb", "Mar", "Apr", "Jun", "Jul", "Aug", "Sep", "Sept", "Oct", "Nov", "Dec",
     ]
 )
+_MONTH_WORDS = frozenset(m.lower() for m in MONTHS.split("|"))
+_WORD_YEAR_RE = re.compile(r"([A-Za-z]+)\s+\d{4}")
+
+
+def _has_month_year(line: str) -> bool:
+    """True if the line has "<Month> <YYYY>" (full or short month name, any case)."""
+    return any(m.group(1).lower() in _MONTH_WORDS for m in _WORD_YEAR_RE.finditer(line))
 
 
 def _extract_travels(page: Page, logger: logging.Logger) -> List[Dict[str, Union[str, int]]]:
@@ -1095,7 +1137,7 @@ def _extract_travels(page: Page, logger: logging.Logger) -> List[Dict[str, Union
     for i in range(len(lines) - 1):
         line1, line2 = lines[i], lines[i + 1]
         if re.match(r"^[A-Za-zÀ-ÿ'.\- ]+,\s+[A-Za-zÀ-ÿ'.\- ]+$", line1):
-            if re.search(rf"({MONTHS})\s+\d{{4}}", line2, re.IGNORECASE) or re.search(
+            if _has_month_year(line2) or re.search(
                 r"\b\d+\s+trips?\b", line2, re.IGNORECASE
             ):
                 city, country, trips = line1.split(",")[0].strip(), line1.split(",")[1].strip(), 0
@@ -1340,7 +1382,52 @@ def _extract_some_reviews(page: Page, logger: logging.Logger, max_reviews: int =
 
 # ------------------------------- Main runner ---------------------------------
 
-def scrape_host(host_url: str):
+def _close_quietly(target: Any) -> None:
+    try:
+        target.close()
+    except Exception:
+        pass
+
+
+class HostScraperPool:
+    """
+    One Chromium instance shared by many host scrapes; each scrape gets its own
+    fresh (stealth) context, which is far cheaper than relaunching the browser.
+    """
+
+    def __init__(self, playwright: Playwright):
+        self.browser: Browser = playwright.chromium.launch(
+            headless=False,
+            proxy=HostConfig.CONFIG_PROXY,
+            args=[
+                "--disable-features=Translate,TranslateUI,LanguageSettings",
+                "--lang=en-US",
+                "--disable-infobars",
+                "--disable-extensions",
+                "--no-first-run",
+                "--disable-default-apps",
+            ],
+        )
+
+    def acquire(self) -> BrowserContext:
+        context = self.browser.new_context(
+            viewport={"width": 1400, "height": 900},
+            locale="en-US",
+            extra_http_headers={"Accept-Language": "en-US,en;q=0.9,fr;q=0.7,ar;q=0.6"},
+        )
+        return Tarnished.apply_stealth(context)
+
+    def close(self) -> None:
+        _close_quietly(self.browser)
+
+    def __enter__(self) -> "HostScraperPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def scrape_host(host_url: str, pool: Optional[HostScraperPool] = None):
     logger = Utils.setup_logger()
     db = Utils.connect_db()
     SQL.init_all_tables(db)
@@ -1367,391 +1454,442 @@ def scrape_host(host_url: str):
 
     request_client_version: Optional[str] = None
 
-    with sync_playwright() as p:
-        browser: Browser = p.chromium.launch(
-            headless=False,
-            proxy=HostConfig.CONFIG_PROXY,
-            args=[
-                "--disable-features=Translate,TranslateUI,LanguageSettings",
-                "--lang=en-US",
-                "--disable-infobars",
-                "--disable-extensions",
-                "--no-first-run",
-                "--disable-default-apps",
-            ],
-        )
-        context: BrowserContext = browser.new_context(
-            viewport={"width": 1400, "height": 900},
-            locale="en-US",
-            extra_http_headers={"Accept-Language": "en-US,en;q=0.9,fr;q=0.7,ar;q=0.6"},
-        )
-        context = Tarnished.apply_stealth(context)
-
-        def handle_request(route: Route):
-            nonlocal request_item_token, request_item_client_id, request_headers, x_airbnb_api_key_captured, request_client_version
-            req = route.request
-            if "/api/v3/StaysPdpSections" in req.url:
-                token = _extract_pdp_token_from_request(req)
-                if token and not request_item_token:
-                    request_item_token, request_item_client_id = token, req.headers.get("x-client-request-id")
-                    logger.info(f"[route] PDP token = {request_item_token}")
-                request_headers = req.headers.copy()
-                api_k = req.headers.get("x-airbnb-api-key")
-                if api_k:
-                    x_airbnb_api_key_captured = api_k.strip()
-                request_client_version = req.headers.get("x-client-version") or request_client_version
-            route.continue_()
-
-        context.route("**/api/v3/*", handle_request)
-
-        def on_request(req: Request):
-            nonlocal request_item_token, request_item_client_id, request_headers, x_airbnb_api_key_captured, request_client_version
-            if "/api/v3/StaysPdpSections" in req.url:
-                token = _extract_pdp_token_from_request(req)
-                if token and not request_item_token:
-                    request_item_token, request_item_client_id = token, req.headers.get("x-client-request-id")
-                    logger.info(f"[event] PDP token captured = {request_item_token}")
-                request_headers = req.headers.copy()
-                api_k = req.headers.get("x-airbnb-api-key")
-                if api_k:
-                    x_airbnb_api_key_captured = api_k.strip()
-                request_client_version = req.headers.get("x-client-version") or request_client_version
-
-        context.on("request", on_request)
-
-        page = context.new_page()
-        page.set_default_timeout(60000)
-        logger.info(f"[host] Visiting host page…")
-        page.goto(host_url, wait_until="domcontentloaded", timeout=60000)
-        HostScrapingUtils._dismiss_any_popups_enhanced(page, logger, max_attempts=4)
-        _wait_profile_ready(page, logger)
-
-        # --- PROFILE HEADER FIELDS (avatar + name + badges) ---
-        host_name: Optional[str] = None
-        profile_photo_url: Optional[str] = None
-
-        # 1) Prefer the name inside the avatar/profile header card
-        for sel in [
-            '[data-testid*="user-profile-header"] [data-testid*="name"]',
-            '[data-testid*="user-profile-header"] h1',
-            '[data-testid*="user-profile-header"] h2',
-            'div.h1oqg76h h1',                 # common container for the top card
-            'div.h1oqg76h h2',
-            'div.h1oqg76h [data-testid*="name"]',
-        ]:
-            try:
-                loc = page.locator(sel).first
-                if loc.count():
-                    t = (loc.inner_text(timeout=1500) or "").strip()
-                    # reject obvious non-names like “Identity verified”, “Host”, or headings
-                    if t and len(t) <= 60 and not re.search(r'\b(Identity verified|Host)\b', t, re.I):
-                        host_name = t
-                        break
-            except Exception:
-                pass
+    # Host profile is accumulated in memory and written once, even if the run fails midway
+    profile_accum: Dict[str, Any] = {"userId": user_id, "userUrl": host_url, "profile_url": host_url}
+    ab: Dict[str, Optional[str]] = {}
 
-        # 2) Fallback to the page H1 if needed
-        if not host_name:
-            for sel in ['main h1', '[data-testid*="user-profile"] h1', 'h1:visible']:
+    try:
+        with contextlib.ExitStack() as stack:
+            # Standalone run: own the browser; otherwise borrow it from the caller's pool
+            if pool is None:
+                pool = stack.enter_context(HostScraperPool(stack.enter_context(sync_playwright())))
+            context: BrowserContext = pool.acquire()
+            stack.callback(_close_quietly, context)
+
+            def handle_request(route: Route):
+                nonlocal request_item_token, request_item_client_id, request_headers, x_airbnb_api_key_captured, request_client_version
+                req = route.request
+                if "/api/v3/StaysPdpSections" in req.url:
+                    token = _extract_pdp_token_from_request(req)
+                    if token and not request_item_token:
+                        request_item_token, request_item_client_id = token, req.headers.get("x-client-request-id")
+                        logger.info(f"[route] PDP token = {request_item_token}")
+                    request_headers = req.headers.copy()
+                    api_k = req.headers.get("x-airbnb-api-key")
+                    if api_k:
+                        x_airbnb_api_key_captured = api_k.strip()
+                    request_client_version = req.headers.get("x-client-version") or request_client_version
+                route.continue_()
+
+            context.route("**/api/v3/*", handle_request)
+
+            def on_request(req: Request):
+                nonlocal request_item_token, request_item_client_id, request_headers, x_airbnb_api_key_captured, request_client_version
+                if "/api/v3/StaysPdpSections" in req.url:
+                    token = _extract_pdp_token_from_request(req)
+                    if token and not request_item_token:
+                        request_item_token, request_item_client_id = token, req.headers.get("x-client-request-id")
+                        logger.info(f"[event] PDP token captured = {request_item_token}")
+                    request_headers = req.headers.copy()
+                    api_k = req.headers.get("x-airbnb-api-key")
+                    if api_k:
+                        x_airbnb_api_key_captured = api_k.strip()
+                    request_client_version = req.headers.get("x-client-version") or request_client_version
+
+            context.on("request", on_request)
+
+            page = context.new_page()
+            page.set_default_timeout(60000)
+            logger.info(f"[host] Visiting host page…")
+            page.goto(host_url, wait_until="domcontentloaded", timeout=60000)
+            HostScrapingUtils._dismiss_any_popups_enhanced(page, logger, max_attempts=4)
+            _wait_profile_ready(page, logger)
+            pdp_bg_page = _open_pdp_in_background(context, page, logger)
+
+            # --- PROFILE HEADER FIELDS (avatar + name + badges) ---
+            host_name: Optional[str] = None
+            profile_photo_url: Optional[str] = None
+
+            # 1) Prefer the name inside the avatar/profile header card
+            for sel in [
+                '[data-testid*="user-profile-header"] [data-testid*="name"]',
+                '[data-testid*="user-profile-header"] h1',
+                '[data-testid*="user-profile-header"] h2',
+                'div.h1oqg76h h1',                 # common container for the top card
+                'div.h1oqg76h h2',
+                'div.h1oqg76h [data-testid*="name"]',
+            ]:
                 try:
                     loc = page.locator(sel).first
                     if loc.count():
                         t = (loc.inner_text(timeout=1500) or "").strip()
-                        if t:
+                        # reject obvious non-names like “Identity verified”, “Host”, or headings
+                        if t and len(t) <= 60 and not re.search(r'\b(Identity verified|Host)\b', t, re.I):
                             host_name = t
                             break
                 except Exception:
                     pass
 
-        # 3) Normalize: strip “About …” in multiple locales and tidy whitespace
-        if host_name:
-            m = re.match(
-                r'^(?:About|À propos de|À propos d’|À propos d\'|Acerca de|Sobre|Über|Informazioni su)\s+(.+)$',
-                host_name, flags=re.IGNORECASE
-            )
-            if m:
-                host_name = m.group(1).strip()
-            host_name = re.sub(r'\s{2,}', ' ', host_name).strip()
-
-        # Avatar (several layouts)
-        for sel in [
-            '[data-testid="user-profile-avatar"] img',
-            'img[src*="/user/"]',
-            'img[alt*="profile"]',
-            'img[alt*="avatar"]'
-        ]:
-            try:
-                loc = page.locator(sel).first
-                if loc.count() and loc.is_visible():
-                    profile_photo_url = loc.get_attribute("src")
-                    if profile_photo_url:
-                        break
-            except Exception:
-                pass
-
-        is_super = 1 if page.locator(':text("Superhost")').count() else 0
-        is_ver = 1 if page.locator(':text("Identity verified"), :text("verified")').count() else 0
-
-        ab = _extract_about_and_bio(page, logger, host_name)
-        guidebooks = _extract_guidebooks(page, logger)
+            # 2) Fallback to the page H1 if needed
+            if not host_name:
+                for sel in ['main h1', '[data-testid*="user-profile"] h1', 'h1:visible']:
+                    try:
+                        loc = page.locator(sel).first
+                        if loc.count():
+                            t = (loc.inner_text(timeout=1500) or "").strip()
+                            if t:
+                                host_name = t
+                                break
+                    except Exception:
+                        pass
 
-        if guidebooks:
-            SQL.replace_host_guidebooks(db, user_id, guidebooks)
-        travels = _extract_travels(page, logger)
-        if travels:
-            SQL.replace_host_travels(db, user_id, travels)
-        reviews = _extract_host_reviews_tab_or_modal(page, logger, max_keep=10000)
-        if not reviews:
-            reviews = _extract_host_reviews_modal(page, logger)
+            # 3) Normalize: strip “About …” in multiple locales and tidy whitespace
+            if host_name:
+                m = re.match(
+                    r'^(?:About|À propos de|À propos d’|À propos d\'|Acerca de|Sobre|Über|Informazioni su)\s+(.+)$',
+                    host_name, flags=re.IGNORECASE
+                )
+                if m:
+                    host_name = m.group(1).strip()
+                host_name = re.sub(r'\s{2,}', ' ', host_name).strip()
 
-        if reviews:
-            SQL.upsert_host_reviews(db, user_id, reviews)
-            SQL.backfill_host_child_names(db, user_id)
+            # Avatar (several layouts)
+            for sel in [
+                '[data-testid="user-profile-avatar"] img',
+                'img[src*="/user/"]',
+                'img[alt*="profile"]',
+                'img[alt*="avatar"]'
+            ]:
+                try:
+                    loc = page.locator(sel).first
+                    if loc.count() and loc.is_visible():
+                        profile_photo_url = loc.get_attribute("src")
+                        if profile_photo_url:
+                            break
+                except Exception:
+                    pass
 
-        # 1. CALL THE UTILS FUNCTION TO GET THE DATA
-        dom_stats = Utils.extract_profile_from_dom(page, logger)
-
-        base_profile = {
-            "userId": user_id,
-            "userUrl": host_url,
-            "name": host_name,
-            "isSuperhost": is_super,
-            "isVerified": is_ver,
-            "ratingAverage": dom_stats.get("ratingAverage"),
-            "ratingCount": dom_stats.get("ratingCount"),
-            "years": dom_stats.get("years"),
-            "months": dom_stats.get("months"),
-            "total_listings": None,
-            "profile_url": host_url,
-            "scraping_time": int(time.time()),
-            "profile_photo_url": profile_photo_url,
-        }
-        SQL.upsert_host_profile(db, _safe_profile_payload(base_profile, ab))
-
-        human = HumanMouseMovement(page)
-        vp = page.viewport_size or {"width": 1400, "height": 900}
-        human.move_to(int(vp["width"] * 0.45), int(vp["height"] * 0.45))
-
-        _open_all_listings_and_expand(page, logger)
-        listing_links = _collect_room_links_from_dom(page, logger, max_scrolls=60)
-        if not listing_links:
-            logger.warning("[host] No /rooms/ links found on host page.")
-
-        listing_items = []
-        for link in listing_links:
-            m = re.search(r"/rooms/(\d+)", link)
-            if m:
-                listing_items.append({"listingId": str(m.group(1)), "listingUrl": f"https://www.airbnb.com/rooms/{m.group(1)}"})
+            is_super = 1 if page.locator(':text("Superhost")').count() else 0
+            is_ver = 1 if page.locator(':text("Identity verified"), :text("verified")').count() else 0
+
+            ab = _extract_about_and_bio(page, logger, host_name)
+            guidebooks = _extract_guidebooks(page, logger)
+
+            if guidebooks:
+                SQL.replace_host_guidebooks(db, user_id, guidebooks)
+            travels = _extract_travels(page, logger)
+            if travels:
+                SQL.replace_host_travels(db, user_id, travels)
+            reviews = _extract_host_reviews_tab_or_modal(page, logger, max_keep=10000)
+            if not reviews:
+                reviews = _extract_host_reviews_modal(page, logger)
+
+            if reviews:
+                SQL.upsert_host_reviews(db, user_id, reviews)
+                SQL.backfill_host_child_names(db, user_id)
+
+            # 1. CALL THE UTILS FUNCTION TO GET THE DATA
+            dom_stats = Utils.extract_profile_from_dom(page, logger)
+
+            base_profile = {
+                "userId": user_id,
+                "userUrl": host_url,
+                "name": host_name,
+                "isSuperhost": is_super,
+                "isVerified": is_ver,
+                "ratingAverage": dom_stats.get("ratingAverage"),
+                "ratingCount": dom_stats.get("ratingCount"),
+                "years": dom_stats.get("years"),
+                "months": dom_stats.get("months"),
+                "total_listings": None,
+                "profile_url": host_url,
+                "scraping_time": int(time.time()),
+                "profile_photo_url": profile_photo_url,
+            }
+            _merge_profile(profile_accum, base_profile)
+
+            human = HumanMouseMovement(page)
+            vp = page.viewport_size or {"width": 1400, "height": 900}
+            human.move_to(int(vp["width"] * 0.45), int(vp["height"] * 0.45))
+
+            _open_all_listings_and_expand(page, logger)
+            listing_items = _collect_room_items_from_dom(page, logger, max_scrolls=60)
+            if not listing_items:
+                logger.warning("[host] No /rooms/ links found on host page.")
 
-        try:
-            SQL.replace_host_listings(db, user_id, listing_items)
-            logger.info(f"[host] Saved {len(listing_items)} listing rows for userId={user_id}")
-        except Exception as e:
-            logger.warning(f"[host] Failed saving host_listings: {e}")
-
-        base_profile2 = {
-            "userId": user_id,
-            "userUrl": host_url,
-            "name": host_name,
-            "total_listings": len(listing_items),
-            "profile_url": host_url,
-            "scraping_time": int(time.time()),
-            "profile_photo_url": profile_photo_url,
-        }
-        SQL.upsert_host_profile(db, _safe_profile_payload(base_profile2, ab))
-
-        if listing_items and not request_item_token:
-            _ensure_pdp_token_via_link(context, logger, listing_items[0]["listingUrl"])
-
-        processed, detailed = 0, 0
-        HOST_MAX = min(HOST_MAX_LISTINGS, len(listing_items))
-
-        for item in listing_items[:HOST_MAX]:
-            _id = item["listingId"]
-            processed += 1
-
-            # PDP hydration + details
-            if request_item_token and detailed < HOST_DETAIL_SCRAPE_LIMIT:
-                try:
-                    info = {
-                        "id": _id,
-                        "link": item["listingUrl"],
-                        "checkin": checkin_date,
-                        "checkout": checkout_date,
-                    }
-
-                    # ---- Build session-authenticated headers ----
-                    base_h = (request_headers or {}).copy()
-                    base_h.pop("content-length", None)
-
-                    # Mirror the live browser UA
+            try:
+                # Stamp rows with the name found on this run (host_tracking is only written at the end)
+                SQL.replace_host_listings(db, user_id, listing_items, host_name=profile_accum.get("name"))
+                logger.info(f"[host] Saved {len(listing_items)} listing rows for userId={user_id}")
+            except Exception as e:
+                logger.warning(f"[host] Failed saving host_listings: {e}")
+
+            base_profile2 = {
+                "userId": user_id,
+                "userUrl": host_url,
+                "name": host_name,
+                "total_listings": len(listing_items),
+                "profile_url": host_url,
+                "scraping_time": int(time.time()),
+                "profile_photo_url": profile_photo_url,
+            }
+            _merge_profile(profile_accum, base_profile2)
+
+            if pdp_bg_page is not None:
+                if not request_item_token:
                     try:
-                        ua = page.evaluate("() => navigator.userAgent") or None
-                        if ua:
-                            base_h["user-agent"] = ua
+                        pdp_bg_page.wait_for_load_state("networkidle", timeout=20000)
                     except Exception:
                         pass
+                try:
+                    pdp_bg_page.close()
+                except Exception:
+                    pass
 
-                    # Add browser cookies for session binding
-                    try:
-                        cookies = context.cookies()
-                        cookie_header = "; ".join(
-                            f"{c['name']}={c['value']}" for c in cookies if "airbnb.com" in (c.get("domain") or "")
-                        )
-                        if cookie_header:
-                            base_h["cookie"] = cookie_header
-                    except Exception:
-                        cookies = []
+            if listing_items and not request_item_token:
+                _ensure_pdp_token_via_link(context, logger, listing_items[0]["listingUrl"])
 
-                    # Inject CSRF if present
+            processed, detailed = 0, 0
+            HOST_MAX = min(HOST_MAX_LISTINGS, len(listing_items))
+            existing_ids = SQL.fresh_listing_ids(db, [it["listingId"] for it in listing_items[:HOST_MAX]])
+
+            # The UA is fixed for the session; read it once rather than per listing
+            try:
+                browser_ua = page.evaluate("() => navigator.userAgent") or None
+            except Exception:
+                browser_ua = None
+
+            for item in listing_items[:HOST_MAX]:
+                _id = item["listingId"]
+                processed += 1
+
+                # PDP hydration + details
+                if request_item_token and detailed < HOST_DETAIL_SCRAPE_LIMIT:
                     try:
-                        csrf = next(
-                            (c["value"] for c in cookies if c.get("name") in ("csrf_token", "airbed_csrf_token")),
-                            None,
+                        info = {
+                            "id": _id,
+                            "link": item["listingUrl"],
+                            "checkin": checkin_date,
+                            "checkout": checkout_date,
+                        }
+
+                        # ---- Build session-authenticated headers ----
+                        base_h = (request_headers or {}).copy()
+                        base_h.pop("content-length", None)
+
+                        # Mirror the live browser UA
+                        if browser_ua:
+                            base_h["user-agent"] = browser_ua
+
+                        # Add browser cookies for session binding
+                        try:
+                            cookies = context.cookies()
+                            cookie_header = "; ".join(
+                                f"{c['name']}={c['value']}" for c in cookies if "airbnb.com" in (c.get("domain") or "")
+                            )
+                            if cookie_header:
+                                base_h["cookie"] = cookie_header
+                        except Exception:
+                            cookies = []
+
+                        # Inject CSRF if present
+                        try:
+                            csrf = next(
+                                (c["value"] for c in cookies if c.get("name") in ("csrf_token", "airbed_csrf_token")),
+                                None,
+                            )
+                            if csrf and "x-csrf-token" not in {k.lower(): v for k, v in base_h.items()}:
+                                base_h["x-csrf-token"] = csrf
+                        except Exception:
+                            pass
+
+                        # GraphQL context headers
+                        base_h.setdefault("x-airbnb-graphql-platform", "web")
+                        base_h.setdefault("x-airbnb-graphql-platform-client", "web")
+                        base_h.setdefault("origin", "https://www.airbnb.com")
+                        # referer is filled per listing by scrape_single_result
+
+                        # Captured key and client info
+                        if x_airbnb_api_key_captured:
+                            base_h["x-airbnb-api-key"] = x_airbnb_api_key_captured
+                        if request_client_version:
+                            base_h["x-client-version"] = request_client_version
+                        if request_item_client_id:
+                            base_h["x-client-request-id"] = request_item_client_id
+
+                        # ---- Call the scraper with merged headers ----
+                        _get_pdp_limiter().take()
+                        dd = HostScrapingUtils.scrape_single_result(
+                            context=context,
+                            item_search_token=request_item_token,
+                            listing_info=info,
+                            logger=logger,
+                            api_key=x_airbnb_api_key_captured,
+                            client_version=request_client_version or "",
+                            client_request_id=request_item_client_id or "",
+                            federated_search_id="",
+                            currency="MAD",
+                            locale="en",
+                            base_headers=base_h,  # use the real browser headers
                         )
-                        if csrf and "x-csrf-token" not in {k.lower(): v for k, v in base_h.items()}:
-                            base_h["x-csrf-token"] = csrf
-                    except Exception:
-                        pass
 
-                    # GraphQL context headers
-                    base_h.setdefault("x-airbnb-graphql-platform", "web")
-                    base_h.setdefault("x-airbnb-graphql-platform-client", "web")
-                    base_h.setdefault("origin", "https://www.airbnb.com")
-                    base_h.setdefault("referer", item["listingUrl"])
-
-                    # Captured key and client info
-                    if x_airbnb_api_key_captured:
-                        base_h["x-airbnb-api-key"] = x_airbnb_api_key_captured
-                    if request_client_version:
-                        base_h["x-client-version"] = request_client_version
-                    if request_item_client_id:
-                        base_h["x-client-request-id"] = request_item_client_id
-
-                    # ---- Call the scraper with merged headers ----
-                    dd = HostScrapingUtils.scrape_single_result(
-                        context=context,
-                        item_search_token=request_item_token,
-                        listing_info=info,
-                        logger=logger,
-                        api_key=x_airbnb_api_key_captured,
-                        client_version=request_client_version or "",
-                        client_request_id=request_item_client_id or "",
-                        federated_search_id="",
-                        currency="MAD",
-                        locale="en",
-                        base_headers=base_h,  # use the real browser headers
-                    )
-
-                    if not dd.get("skip", False):
-                        dd["checkin"] = checkin_date
-                        dd["checkout"] = checkout_date
-                        dd["ListingUrl"] = item["listingUrl"]
-                        # NEW: If the profile About/Bio were empty, but PDP exposed a host about text, use it.
-                        if not (ab.get("about_text") or ab.get("bio_text")) and dd.get("hostAboutText"):
-                            ab["about_text"] = dd["hostAboutText"]
-                        # Insert as a full listing
-                        dd["ListingId"] = _id
-                        dd["ListingObjType"] = _classify_listing(dd)
-                        dd["link"] = item["listingUrl"]
-                        # Ensure dd carries userUrl so it can be saved into listing_tracking
-                        if not dd.get("userUrl") and dd.get("userId"):
-                            dd["userUrl"] = f"https://www.airbnb.com/users/profile/{dd['userId']}"
-
-                        SQL.insert_new_listing(db, dd)
-
-                        host_name = dd.get("host") or host_name
-                        if host_name:
-                            SQL.update_host_listing_name(db, user_id, _id, host_name)
-
-                        pics = dd.get("allPictures") or []
-                        if "ListingId" not in dd:
-                            logger.error(f"[host] Missing ListingId for listing {_id} — skipping DB insert.")
-                            continue
-
-                        if pics:
+                        if not dd.get("skip", False):
+                            dd["checkin"] = checkin_date
+                            dd["checkout"] = checkout_date
+                            dd["ListingUrl"] = item["listingUrl"]
+                            # NEW: If the profile About/Bio were empty, but PDP exposed a host about text, use it.
+                            if not (ab.get("about_text") or ab.get("bio_text")) and dd.get("hostAboutText"):
+                                ab["about_text"] = dd["hostAboutText"]
+                            # Insert as a full listing
+                            dd["ListingId"] = _id
+                            dd["ListingObjType"] = _classify_listing(dd)
+                            dd["link"] = item["listingUrl"]
+                            # Ensure dd carries userUrl so it can be saved into listing_tracking
+                            if not dd.get("userUrl") and dd.get("userId"):
+                                dd["userUrl"] = f"https://www.airbnb.com/users/profile/{dd['userId']}"
+
+                            SQL.insert_new_listing(db, dd)
+
+                            host_name = dd.get("host") or host_name
+                            if host_name:
+                                SQL.update_host_listing_name(db, user_id, _id, host_name)
+
+                            pics = dd.get("allPictures") or []
+                            if "ListingId" not in dd:
+                                logger.error(f"[host] Missing ListingId for listing {_id} — skipping DB insert.")
+                                continue
+
+                            if pics:
+                                try:
+                                    from . import host_SQL as SQL_new
+                                    SQL_new.upsert_listing_pictures_horizontal(db, _id, pics)
+                                    logger.info(f"[host] ✅ Stored {len(pics)} pictures for {_id}")
+                                except Exception as e:
+                                    logger.warning(f"[host] saving pictures failed for {_id}: {e}")
+
+                            detailed += 1
+                            logger.info(f"[host] ✅ hydrated {_id} | host={host_name or '—'} | photos={len(pics)}")
+
+                            # Normalize IDs as strings for comparison
+                            _to_str = lambda v: str(v).strip() if v is not None else None
+                            if _to_str(dd.get("userId")) == _to_str(user_id):
+                                base_profile3 = {
+                                    "userId": user_id,
+                                    "userUrl": dd.get("userUrl") or host_url,
+                                    "name": host_name,
+                                    "isSuperhost": int(bool(dd.get("isSuperhost"))),
+                                    "isVerified": int(bool(dd.get("isVerified"))),
+                                    "ratingAverage": dd.get("ratingAverage") or dd.get("hostRatingAverage") or dd.get("hostrAtingAverage"),
+                                    "ratingCount": dd.get("ratingCount"),
+                                    "years": dd.get("years"),
+                                    "months": dd.get("months"),
+                                    "total_listings": len(listing_items),
+                                    "profile_url": host_url,
+                                    "scraping_time": int(time.time()),
+                                    "profile_photo_url": profile_photo_url,
+                                }
+                                # Do not overwrite About/Bio here; we already set ab above if needed
+                                _merge_profile(profile_accum, base_profile3)
+
                             try:
-                                from . import host_SQL as SQL_new
-                                SQL_new.upsert_listing_pictures_horizontal(db, _id, pics)
-                                logger.info(f"[host] ✅ Stored {len(pics)} pictures for {_id}")
+                                if host_name:
+                                    SQL.set_host_name_for_listings(db, user_id, host_name)
                             except Exception as e:
-                                logger.warning(f"[host] saving pictures failed for {_id}: {e}")
-
-                        detailed += 1
-                        logger.info(f"[host] ✅ hydrated {_id} | host={host_name or '—'} | photos={len(pics)}")
-
-                        # Normalize IDs as strings for comparison
-                        _to_str = lambda v: str(v).strip() if v is not None else None
-                        if _to_str(dd.get("userId")) == _to_str(user_id):
-                            base_profile3 = {
-                                "userId": user_id,
-                                "userUrl": dd.get("userUrl") or host_url,
-                                "name": host_name,
-                                "isSuperhost": int(bool(dd.get("isSuperhost"))),
-                                "isVerified": int(bool(dd.get("isVerified"))),
-                                "ratingAverage": dd.get("ratingAverage") or dd.get("hostRatingAverage") or dd.get("hostrAtingAverage"),
-                                "ratingCount": dd.get("ratingCount"),
-                                "years": dd.get("years"),
-                                "months": dd.get("months"),
-                                "total_listings": len(listing_items),
-                                "profile_url": host_url,
-                                "scraping_time": int(time.time()),
-                                "profile_photo_url": profile_photo_url,
-                            }
-                            # Do not overwrite About/Bio here; we already set ab above if needed
-                            SQL.upsert_host_profile(db, _safe_profile_payload(base_profile3, {}))
-
-                        SQL.backfill_host_child_names(db, user_id)
+                                logger.warning(f"[host] set_host_name_for_listings failed: {e}")
+
+                    except Exception as e:
+                        logger.info(f"[host] ❌ PDP hydrate failed for {_id}: {e}")
+
+                else:
+
+                    print("ksfljhmsqùmjqogjodsjgojgodjojodjdojgodjgdogjdojgodd")
+                    # Only insert basic listing if PDP not scraped
+                    if _id not in existing_ids:
                         try:
-                            if host_name:
-                                SQL.set_host_name_for_listings(db, user_id, host_name)
+                            SQL.insert_basic_listing(
+                                db,
+                                {
+                                    "ListingId": _id,
+                                    "ListingUrl": item["listingUrl"],
+                                    "link": item["listingUrl"],
+                                    "ListingObjType": _classify_listing({"ListingUrl": item["listingUrl"]}),
+                                },
+                            )
+                            existing_ids.add(_id)
                         except Exception as e:
-                            logger.warning(f"[host] set_host_name_for_listings failed: {e}")
+                            logger.warning(f"[host] Could not insert basic listing {_id}: {e}")
 
-                except Exception as e:
-                    logger.info(f"[host] ❌ PDP hydrate failed for {_id}: {e}")
+            logger.info(f"🎉 [host] COMPLETE | processed listings: {processed} | hydrated: {detailed}")
 
-            else:
+            try:
+                page.close()
+            except Exception:
+                pass
+    finally:
+        try:
+            SQL.upsert_host_profile(db, _safe_profile_payload(profile_accum, ab))
+            SQL.backfill_host_child_names(db, user_id)
+            # Last write: only fills host_listings names still empty, keeps per-listing names
+            SQL.backfill_host_listing_names_from_tracking(db, user_id)
+        except Exception as e:
+            logger.warning(f"[host] Failed saving host profile for userId={user_id}: {e}")
+        db.close()
 
-                print("ksfljhmsqùmjqogjodsjgojgodjojodjdojgodjgdogjdojgodd")
-                # Only insert basic listing if PDP not scraped
-                if not SQL.check_if_listing_exists(db, _id):
-                    try:
-                        SQL.insert_basic_listing(
-                            db,
-                            {
-                                "ListingId": _id,
-                                "ListingUrl": item["listingUrl"],
-                                "link": item["listingUrl"],
-                                "ListingObjType": _classify_listing({"ListingUrl": item["listingUrl"]}),
-                            },
-                        )
-                    except Exception as e:
-                        logger.warning(f"[host] Could not insert basic listing {_id}: {e}")
 
-        logger.info(f"🎉 [host] COMPLETE | processed listings: {processed} | hydrated: {detailed}")
-        SQL.backfill_host_listing_names_from_tracking(db, user_id)
+# PDP pacing for this process; scrape_hosts() installs one limiter shared by all its workers
+_PDP_LIMITER: Optional[Utils.SharedRateLimiter] = None
+
+
+def _get_pdp_limiter() -> Utils.SharedRateLimiter:
+    global _PDP_LIMITER
+    if _PDP_LIMITER is None:
+        _PDP_LIMITER = Utils.SharedRateLimiter(getattr(HostConfig, "HOST_PDP_RATE", 1.5))
+    return _PDP_LIMITER
 
-        try:
-            page.close()
-        except Exception:
-            pass
-        try:
-            context.close()
-        except Exception:
-            pass
-        try:
-            browser.close()
-        except Exception:
-            pass
 
-    db.close()
+def _init_host_worker(limiter: Utils.SharedRateLimiter) -> None:
+    global _PDP_LIMITER
+    _PDP_LIMITER = limiter
+
+
+def _scrape_host_batch(host_urls: List[str]) -> None:
+    """Worker: one browser for this process, hosts scraped one after another."""
+    with sync_playwright() as p, HostScraperPool(p) as pool:
+        for url in host_urls:
+            try:
+                scrape_host(url, pool=pool)
+            except Exception as e:
+                Utils.setup_logger().error(f"[host] scrape failed for {url}: {e}")
+
+
+def scrape_hosts(host_urls: List[str], max_concurrency: Optional[int] = None) -> None:
+    """
+    Scrape many hosts with at most `max_concurrency` browsers running at once.
+
+    The sync Playwright API is bound to its thread, so concurrency comes from
+    worker processes, each reusing a single HostScraperPool for its share of URLs.
+    """
+    if max_concurrency is None:
+        max_concurrency = getattr(HostConfig, "HOST_MAX_CONCURRENCY", 3)
+    workers = max(1, min(max_concurrency, len(host_urls)))
+    batches = [host_urls[i::workers] for i in range(workers)]
+    if workers == 1:
+        _scrape_host_batch(batches[0])
+        return
+    # One limiter across all workers: they share the proxy IP, so the PDP rate cap is global
+    with multiprocessing.Pool(
+        processes=workers, initializer=_init_host_worker, initargs=(_get_pdp_limiter(),)
+    ) as mp_pool:
+        mp_pool.map(_scrape_host_batch, batches)
 
 
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        print("Usage: python -m airbnb_host.host_agent <host_profile_url>")
+        print("Usage: python -m airbnb_host.host_agent <host_profile_url> [<host_profile_url> ...]")
         sys.exit(1)
-    scrape_host(sys.argv[1])
+    if len(sys.argv) == 2:
+        scrape_host(sys.argv[1])
+    else:
+        scrape_hosts(sys.argv[1:])
 # --- END OF FILE host_agent.py ---
@@ -1,17 +1,80 @@
 
+import copy
 import json
 import logging
+import multiprocessing
 import sqlite3
 import urllib.parse
 import re
 import time
 from typing import Any, Dict, List, Optional
 
-from playwright.sync_api import BrowserContext, Request, Response, Page
+import orjson
+from playwright.sync_api import APIRequestContext, BrowserContext, Playwright, Request, Response, Route, Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from .config import HostConfig 
 
 
+# Patterns used by the rating parsers in extract_profile_from_dom
+_RATING_RE = re.compile(r'(\d+\.?\d*)')
+_REVIEW_COUNT_RE = re.compile(r'\((\d+)[^)]*review', re.IGNORECASE)
+_STAT_NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
+# Patterns used while walking travel cards in extract_profile_from_dom
+_TRIP_RE = re.compile(r'(\d+)\s*trip', re.IGNORECASE)
+_WORD_YEAR_RE = re.compile(r'([A-Za-z]+)\s+(\d{4})')
+_MONTH_NAMES = frozenset([
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+])
+
+
+def _find_month_year(text: str) -> Optional[str]:
+    """First "<Month> <YYYY>" in text: one scan for word+year pairs, month checked by set lookup."""
+    for m in _WORD_YEAR_RE.finditer(text):
+        if m.group(1) in _MONTH_NAMES:
+            return f"{m.group(1)} {m.group(2)}"
+    return None
+
+
+_TRAVEL_TILES_JS = """
+els => els.slice(0, 15).map(el => ({
+  visible: el.getClientRects().length > 0,
+  text: el.innerText || "",
+  parent: (el.parentElement && el.parentElement.innerText) || "",
+}))
+"""
+
+# Stat headings, greeting and avatar candidates in one in-page pass (plain CSS only)
+_PROFILE_HEAD_JS = """
+() => {
+  const visible = el => el.getClientRects().length > 0;
+  const text = sel => {
+    const el = document.querySelector(sel);
+    return el ? (el.innerText || "").trim() : null;
+  };
+  const greeting = Array.from(document.querySelectorAll("h1"))
+    .find(h => visible(h) && (h.innerText || "").includes("Hi, I'm"));
+  const photos = [
+    ...document.querySelectorAll('[data-testid="host-avatar"] img'),
+    ...document.querySelectorAll('img[data-testid="profile-photo"]'),
+    ...Array.from(document.querySelectorAll("section"))
+      .filter(s => (s.innerText || "").includes("About"))
+      .flatMap(s => Array.from(s.querySelectorAll('img[src*="profile"]'))),
+  ].filter(visible).map(img => img.getAttribute("src") || "");
+  return {
+    reviews: text('[data-testid="Reviews-stat-heading"]'),
+    rating: text('[data-testid="Rating-stat-heading"]'),
+    years: text('[data-testid="Years hosting-stat-heading"]'),
+    months: text('[data-testid="Months hosting-stat-heading"]'),
+    greeting: greeting ? greeting.innerText.trim() : null,
+    photos,
+  };
+}
+"""
+
+
 def extract_profile_from_dom(page: Page, logger: logging.Logger) -> Dict[str, Any]:
     """
     FIXED: Better DOM extraction with more specific selectors for Airbnb profile data.
@@ -39,90 +102,51 @@ def extract_profile_from_dom(page: Page, logger: logging.Logger) -> Dict[str, An
     }
     
     try:
-        # Wait for content to load
-        page.wait_for_timeout(3000)
+        # Wait for content to load: proceed as soon as the network settles
+        try:
+            page.wait_for_load_state("networkidle", timeout=5000)
+        except Exception:
+            pass
+
+        try:
+            body_text = page.evaluate("() => document.body.innerText") or ""
+        except Exception:
+            body_text = ""
 
 
+        # Stats, name and photo: one evaluate instead of a locator round-trip per selector
         try:
-            # 1. Reviews Count
+            head = page.evaluate(_PROFILE_HEAD_JS) or {}
+
             # HTML: <span data-testid="Reviews-stat-heading">84</span>
-            rev_el = page.locator('[data-testid="Reviews-stat-heading"]').first
-            if rev_el.count():
-                txt = rev_el.inner_text().strip()
-                if txt.isdigit():
-                    profile["ratingCount"] = int(txt)
+            if (head.get("reviews") or "").isdigit():
+                profile["ratingCount"] = int(head["reviews"])
 
-            # 2. Rating Average
             # HTML: <span data-testid="Rating-stat-heading">4.92...</span>
-            rate_el = page.locator('[data-testid="Rating-stat-heading"]').first
-            if rate_el.count():
-                # Extract just the number "4.92" ignoring any SVG icons
-                m = re.search(r"(\d+(?:\.\d+)?)", rate_el.inner_text())
-                if m:
-                    profile["ratingAverage"] = float(m.group(1))
-
-            # 3. Years/Months Hosting
+            m = _STAT_NUMBER_RE.search(head.get("rating") or "")
+            if m:
+                profile["ratingAverage"] = float(m.group(1))
+
             # HTML: <span data-testid="Months hosting-stat-heading">6</span>
-            for unit in ["Years", "Months"]:
-                time_el = page.locator(f'[data-testid="{unit} hosting-stat-heading"]').first
-                if time_el.count():
-                    txt = time_el.inner_text().strip()
-                    if txt.isdigit():
-                        profile[unit.lower()] = int(txt)
-            
+            for unit in ("years", "months"):
+                if (head.get(unit) or "").isdigit():
+                    profile[unit] = int(head[unit])
+
             if profile["ratingAverage"]:
                 logger.info(f"✅ Specific Stats Found: {profile['ratingAverage']} ({profile['ratingCount']})")
-        except Exception:
-            pass
-
-
 
+            name = (head.get("greeting") or "").replace("Hi, I'm", "").strip()
+            if name:
+                profile["name"] = name
+                logger.info(f"✅ Found host name: {name}")
 
-
-        
-        # Extract host name - More specific selectors
-        name_selectors = [
-            'h1:has-text("Hi, I\'m")',
-            '[data-testid="host-name"] h1',
-            'section:has-text("About") h1',
-        ]
-
-        
-        for selector in name_selectors:
-            try:
-                elem = page.locator(selector).first
-                elem.wait_for(state="visible", timeout=2000)  # will raise if not visible
-                text = elem.inner_text().strip()
-                if "Hi, I'm" in text:
-                    name = text.replace("Hi, I'm", "").strip()
-                    if name:
-                        profile["name"] = name
-                        logger.info(f"✅ Found host name: {name}")
-                        break
-            except Exception:
-                continue
-
-        
-        # Extract profile photo - More specific
-        photo_selectors = [
-            '[data-testid="host-avatar"] img',
-            'img[data-testid="profile-photo"]',
-            'section:has-text("About") img[src*="profile"]'
-        ]
-        
-        for selector in photo_selectors:
-            try:
-                img = page.locator(selector).first
-                if img.is_visible(timeout=2000):
-                    src = img.get_attribute("src")
-                    if src and any(keyword in src.lower() for keyword in ["profile", "user", "pictures"]):
-                        profile["profile_photo_url"] = src
-                        logger.info(f"✅ Found profile photo")
-                        break
-            except Exception:
-                continue
-        
-        
+            for src in head.get("photos") or []:
+                if any(keyword in src.lower() for keyword in ["profile", "user", "pictures"]):
+                    profile["profile_photo_url"] = src
+                    logger.info(f"✅ Found profile photo")
+                    break
+        except Exception as e:
+            logger.debug(f"Profile head extraction failed: {e}")
 
 # Extract ACTUAL bio text (NOT page UI elements) - Fixed selectors
         bio_selectors = [
@@ -142,7 +166,7 @@ def extract_profile_from_dom(page: Page, logger: logging.Logger) -> Dict[str, An
                 
                 for i in range(min(count, 3)):  # Check first 3 matches
                     elem = elems.nth(i)
-                    if elem.is_visible(timeout=1000):
+                    if elem.is_visible():
                         text = elem.inner_text().strip()
                         
                         # Skip UI elements and navigation text
@@ -182,7 +206,7 @@ def extract_profile_from_dom(page: Page, logger: logging.Logger) -> Dict[str, An
                     '[data-section-id*="guidebook"]'
                 ).first
 
-            if guidebook_section.is_visible(timeout=2000):
+            if guidebook_section.is_visible():
                 # Find all guidebook links within this section
                 guidebook_links = guidebook_section.locator('a[href*="/guidebooks/"]')
                 count = guidebook_links.count()
@@ -195,7 +219,7 @@ def extract_profile_from_dom(page: Page, logger: logging.Logger) -> Dict[str, An
                         title_elem = link.locator('h3, [data-testid*="title"], div:has-text("")').first
                         
                         title = ""
-                        if title_elem.is_visible(timeout=500):
+                        if title_elem.is_visible():
                             title = title_elem.inner_text().strip()
                         
                         if not title:
@@ -228,57 +252,42 @@ def extract_profile_from_dom(page: Page, logger: logging.Logger) -> Dict[str, An
             
             for travel_selector in travel_selectors:
                 try:
-                    travel_items = page.locator(travel_selector)
-                    count = travel_items.count()
+                    # One round-trip per selector: visibility + own/parent text for the first 15 tiles
+                    candidates = page.locator(travel_selector).evaluate_all(_TRAVEL_TILES_JS)
                     
-                    logger.info(f"Checking {count} potential travel items with selector: {travel_selector}")
+                    logger.info(f"Checking {len(candidates)} potential travel items with selector: {travel_selector}")
                     
-                    for i in range(min(count, 15)):  # Limit to 15
-                        try:
-                            item = travel_items.nth(i)
-                            if not item.is_visible(timeout=500):
-                                continue
-                            
-                            text = item.inner_text().strip()
-                            
-                            # Look for location patterns (City, Country format)
-                            if ", " in text and len(text.split()) <= 4:
-                                parts = text.split(", ")
-                                if len(parts) >= 2:
-                                    place = parts[0].strip()
-                                    country = parts[1].strip()
-                                    
-                                    # Try to extract trip count and date
-                                    trips = 1
-                                    when = "Unknown"
-                                    
-                                    # Look for trip count in nearby elements
-                                    try:
-                                        parent = item.locator("xpath=..")
-                                        trip_text = parent.inner_text()
-                                        
-                                        trip_match = re.search(r'(\d+)\s*trip', trip_text.lower())
-                                        if trip_match:
-                                            trips = int(trip_match.group(1))
-                                        
-                                        date_match = re.search(r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{4})', trip_text)
-                                        if date_match:
-                                            when = f"{date_match.group(1)} {date_match.group(2)}"
-                                            
-                                    except Exception:
-                                        pass
-                                    
-                                    profile["travels"].append({
-                                        "place": place,
-                                        "country": country,
-                                        "trips": trips,
-                                        "when_label": when
-                                    })
-                                    logger.info(f"✅ Found travel: {place}, {country}")
-                                    
-                        except Exception as e:
-                            logger.debug(f"Error processing travel item {i}: {e}")
+                    for c in candidates:
+                        if not c.get("visible"):
                             continue
+                        
+                        text = (c.get("text") or "").strip()
+                        
+                        # Look for location patterns (City, Country format)
+                        if ", " in text and len(text.split()) <= 4:
+                            parts = text.split(", ")
+                            if len(parts) >= 2:
+                                place = parts[0].strip()
+                                country = parts[1].strip()
+                                
+                                # Trip count and date from the surrounding tile
+                                trips = 1
+                                when = "Unknown"
+                                trip_text = c.get("parent") or ""
+                                
+                                trip_match = _TRIP_RE.search(trip_text)
+                                if trip_match:
+                                    trips = int(trip_match.group(1))
+                                
+                                when = _find_month_year(trip_text) or when
+                                
+                                profile["travels"].append({
+                                    "place": place,
+                                    "country": country,
+                                    "trips": trips,
+                                    "when_label": when
+                                })
+                                logger.info(f"✅ Found travel: {place}, {country}")
                     
                     if profile["travels"]:
                         break  # Found travels, stop trying other selectors
@@ -290,41 +299,13 @@ def extract_profile_from_dom(page: Page, logger: logging.Logger) -> Dict[str, An
         except Exception as e:
             logger.debug(f"Travel extraction failed: {e}")
         
-        # Extract superhost status
-        try:
-            if page.locator(':has-text("Superhost")').first.is_visible(timeout=1000):
-                profile["isSuperhost"] = True
-                logger.info("✅ Host is a Superhost")
-        except Exception:
-            pass
-        
-        # Extract verification status  
-        try:
-            if page.locator(':has-text("Identity verified")').first.is_visible(timeout=1000):
-                profile["isVerified"] = True
-                logger.info("✅ Host is verified")
-        except Exception:
-            pass
-        try:
-            # Reviews
-            rev_el = page.locator('[data-testid="Reviews-stat-heading"]').first
-            if rev_el.count() and rev_el.inner_text().strip().isdigit():
-                profile["ratingCount"] = int(rev_el.inner_text().strip())
-
-            # Rating
-            rate_el = page.locator('[data-testid="Rating-stat-heading"]').first
-            if rate_el.count():
-                m = re.search(r"(\d+(?:\.\d+)?)", rate_el.inner_text())
-                if m:
-                    profile["ratingAverage"] = float(m.group(1))
-
-            # Years/Months
-            for unit in ["Years", "Months"]:
-                time_el = page.locator(f'[data-testid="{unit} hosting-stat-heading"]').first
-                if time_el.count() and time_el.inner_text().strip().isdigit():
-                    profile[unit.lower()] = int(time_el.inner_text().strip())
-        except Exception:
-            pass
+        # Superhost / verification badges: plain substring checks on the rendered text
+        if "Superhost" in body_text:
+            profile["isSuperhost"] = True
+            logger.info("✅ Host is a Superhost")
+        if "Identity verified" in body_text:
+            profile["isVerified"] = True
+            logger.info("✅ Host is verified")
         # Extract ratings - Look for star ratings
         try:
             rating_selectors = [
@@ -336,12 +317,12 @@ def extract_profile_from_dom(page: Page, logger: logging.Logger) -> Dict[str, An
             for selector in rating_selectors:
                 try:
                     elem = page.locator(selector).first
-                    if elem.is_visible(timeout=1000):
+                    if elem.is_visible():
                         text = elem.inner_text()
                         
                         # Look for rating pattern like "4.9 (123 reviews)"
-                        rating_match = re.search(r'(\d+\.?\d*)', text)
-                        count_match = re.search(r'\((\d+).*review', text, re.IGNORECASE)
+                        rating_match = _RATING_RE.search(text)
+                        count_match = _REVIEW_COUNT_RE.search(text)
                         
                         if rating_match:
                             rating_val = float(rating_match.group(1))
@@ -370,10 +351,20 @@ def extract_profile_from_dom(page: Page, logger: logging.Logger) -> Dict[str, An
 
 
 # Keep all other functions unchanged...
+_IGNORE_HDRS = frozenset({':authority', ':method', ':path', ':scheme', 'content-length'})
+
+
 def _clean_headers(h: Dict[str, str]) -> Dict[str, str]:
     """Remove pseudo/forbidden headers so we can safely replay requests."""
-    ignore = {':authority', ':method', ':path', ':scheme', 'content-length'}
-    return {k: v for k, v in (h or {}).items() if k.lower() not in ignore and not k.startswith(':')}
+    if not h:
+        return {}
+    # Captured headers are usually already clean: a plain copy skips the filtering pass
+    for k in h:
+        if k[:1] == ':' or k.lower() == 'content-length':
+            break
+    else:
+        return dict(h)
+    return {k: v for k, v in h.items() if k[:1] != ':' and k.lower() not in _IGNORE_HDRS}
 
 
 def setup_logger() -> logging.Logger:
@@ -388,9 +379,156 @@ def setup_logger() -> logging.Logger:
     return logger
 
 
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+# Host workers share one DB file; their DDL/upserts wait for each other instead of failing fast
+_SQLITE_BUSY_TIMEOUT_S = 30.0
+
+
 def connect_db() -> sqlite3.Connection:
-    """Open the same SQLite DB your project uses."""
-    return sqlite3.connect(HostConfig.CONFIG_DB_FILE)
+    """Open the same SQLite DB your project uses (WAL so readers don't block the writer)."""
+    db = sqlite3.connect(HostConfig.CONFIG_DB_FILE, timeout=_SQLITE_BUSY_TIMEOUT_S)
+    for pragma in _SQLITE_PRAGMAS:
+        db.execute(pragma)
+    return db
+
+
+class SharedRateLimiter:
+    """
+    Cross-process pacing: callers in every worker process are spaced 1/rate seconds apart
+    through one shared "next free slot" timestamp (CLOCK_MONOTONIC is system-wide).
+
+    Create it in the parent and hand it to workers at start-up (Pool initializer), since
+    the underlying lock and shared value can only be inherited, not pickled per task.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.lock = multiprocessing.Lock()
+        self.next_slot = multiprocessing.Value("d", 0.0, lock=False)
+
+    def take(self) -> None:
+        # Claim a slot under the lock, sleep outside it so other processes can queue up
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next_slot.value)
+            self.next_slot.value = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+# Variable names that identify a "host listings" GraphQL request
+_LISTING_KEYS = {"listing", "listings", "listingid", "listingids"}
+_USER_KEYS = {"user", "host", "userid", "hostid"}
+_CURSOR_KEYS = frozenset({"cursor", "Cursor", "CURSOR"})
+# Response fields that may carry the next page cursor, highest priority first
+_NEXT_CURSOR_KEYS = ("next", "cursor", "nextCursor", "nextPageCursor")
+
+
+# Operation-name fragments of the GraphQL calls that carry host profile data
+_PROFILE_OP_HINTS = ("user", "host", "profile")
+
+
+def _operation_name(url: str) -> Optional[str]:
+    """GraphQL operation name from an /api/v3/<Operation>/<hash> URL."""
+    tail = url.split("?", 1)[0].partition("/api/v3/")[2]
+    return tail.split("/", 1)[0] or None
+
+
+def _is_profile_op(op: Optional[str]) -> bool:
+    if not op:
+        return False
+    op = op.lower()
+    return any(h in op for h in _PROFILE_OP_HINTS)
+
+
+def _parse_template(template: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill headers/operationName/variables/extensions from the raw request kept by on_req (once)."""
+    if "_raw_query" not in template and "_raw_body" not in template:
+        return template
+    raw_query = template.pop("_raw_query", None)
+    raw_body = template.pop("_raw_body", None)
+    template["headers"] = _clean_headers(template.pop("_raw_headers", None))
+
+    # Try to extract operationName/variables/extensions from query params (GET)
+    try:
+        qs = urllib.parse.parse_qs(raw_query or "")
+        if not template["operationName"]:
+            template["operationName"] = (qs.get("operationName") or [None])[0]
+        if "variables" in qs:
+            template["variables"] = json.loads(qs["variables"][0])
+        if "extensions" in qs:
+            template["extensions"] = json.loads(qs["extensions"][0])
+    except Exception:
+        pass
+
+    # Or from POST body
+    try:
+        body = json.loads(raw_body) if raw_body else None
+        if isinstance(body, dict):
+            template["operationName"] = template["operationName"] or body.get("operationName")
+            if body.get("variables") is not None:
+                template["variables"] = body["variables"]
+            if body.get("extensions") is not None:
+                template["extensions"] = body["extensions"]
+    except Exception:
+        pass
+
+    return template
+
+
+def _deep_keys(o: Any):
+    """Yield lower-cased dict keys anywhere in a nested structure (lazily, so callers can stop early)."""
+    for node in _deep_items(o):
+        for k in node.keys():
+            yield k.lower()
+
+
+def _is_listing_template(template: Dict[str, Any]) -> bool:
+    """
+    True when a captured request looks like "host listings" pagination
+    (mentions listings, plus a user/host key or a cursor). Verdict is cached on the template.
+    """
+    verdict = template.get("_is_listing")
+    if verdict is None:
+        _parse_template(template)
+        mentions_listings = mentions_user = has_cursor = False
+        for k in _deep_keys(template.get("variables") or {}):
+            mentions_listings = mentions_listings or k in _LISTING_KEYS
+            mentions_user = mentions_user or k in _USER_KEYS
+            has_cursor = has_cursor or k == "cursor"
+            if mentions_listings and (mentions_user or has_cursor):
+                break
+        verdict = mentions_listings and (mentions_user or has_cursor)
+        template["_is_listing"] = verdict
+    return verdict
+
+
+# Not needed for GraphQL capture or DOM text; CSS is kept because visibility checks depend on layout
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+_BLOCKED_HOST_HINTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net")
+
+
+def _route_skip_heavy(route: Route) -> None:
+    """Abort images/fonts/media and analytics beacons; let everything else through."""
+    req = route.request
+    if req.resource_type in _BLOCKED_RESOURCE_TYPES or any(h in req.url for h in _BLOCKED_HOST_HINTS):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _wait_graphql_settled(page: Page, pending: set, max_ms: int = 2000, step_ms: int = 100) -> None:
+    """Poll until no tracked GraphQL request is in flight (short waits also pump Playwright events)."""
+    for _ in range(max(1, max_ms // step_ms)):
+        if not pending:
+            return
+        page.wait_for_timeout(step_ms)
 
 
 def capture_host_graphql(
@@ -406,68 +544,78 @@ def capture_host_graphql(
     page = context.new_page()
     captured_requests: List[Dict[str, Any]] = []
     captured_responses: List[Dict[str, Any]] = []
+    pending: set = set()  # in-flight /api/v3/ requests
+    debug = logger.isEnabledFor(logging.DEBUG)  # handlers skip building log strings otherwise
 
     def on_req(req: Request):
         if "/api/v3/" not in req.url:
             return
+        pending.add(req)
 
-        # Build a replay template
+        # Keep the raw query/body; they are only parsed if this request becomes a candidate
+        url, _, query = req.url.partition("?")
         template: Dict[str, Any] = {
-            "url": req.url.split("?")[0],
+            "url": url,
             "method": req.method,
-            "headers": _clean_headers(req.headers),
+            "headers": None,
             "operationName": None,
             "variables": None,
             "extensions": None,
+            "_raw_query": query,
+            "_raw_body": req.post_data,
+            "_raw_headers": req.headers,
         }
 
-        # Try to extract operationName/variables/extensions from query params (GET)
-        try:
-            parsed = urllib.parse.urlparse(req.url)
-            qs = urllib.parse.parse_qs(parsed.query)
-            if not template["operationName"]:
-                template["operationName"] = (qs.get("operationName") or [None])[0]
-            if "variables" in qs:
-                template["variables"] = json.loads(qs["variables"][0])
-            if "extensions" in qs:
-                template["extensions"] = json.loads(qs["extensions"][0])
-        except Exception:
-            pass
-
-        # Or from POST body
-        try:
-            body = req.post_data_json
-            if body:
-                template["operationName"] = template["operationName"] or body.get("operationName")
-                if body.get("variables") is not None:
-                    template["variables"] = body["variables"]
-                if body.get("extensions") is not None:
-                    template["extensions"] = body["extensions"]
-        except Exception:
-            pass
-
         captured_requests.append(template)
-        logger.debug(f"[GraphQL] Captured request: {template.get('operationName', 'Unknown')}")
+        if debug:
+            logger.debug(f"[GraphQL] Captured request: {_operation_name(url) or 'Unknown'}")
 
     def on_res(res: Response):
+        pending.discard(res.request)
         try:
-            if "/api/v3/" in res.url and "application/json" in (res.headers.get("content-type") or ""):
-                json_data = res.json()
-                captured_responses.append(json_data)
-                logger.debug(f"[GraphQL] Captured response from: {res.url}")
+            if "/api/v3/" not in res.url or not _is_profile_op(_operation_name(res.url)):
+                return
+            if "application/json" in (res.headers.get("content-type") or ""):
+                # Raw bytes straight to orjson: no bytes->str copy, empty bodies skipped
+                body = res.body()
+                if body:
+                    captured_responses.append(orjson.loads(body))
+                    if debug:
+                        logger.debug(f"[GraphQL] Captured response from: {res.url}")
         except Exception:
             # Non-JSON or transient fetch error
             pass
 
-    context.on("request", on_req)
-    context.on("response", on_res)
+    # Scope the listeners to this page so they go away with it, and skip heavy assets
+    # the capture never reads (img src attributes are still in the DOM when aborted)
+    page.on("request", on_req)
+    page.on("response", on_res)
+    page.on("requestfailed", pending.discard)
+    try:
+        page.route("**/*", _route_skip_heavy)
+    except Exception:
+        pass
 
     # DOM extraction result
     dom_profile = {}
 
     try:
         logger.info(f"[HOST] Opening profile: {host_url}")
-        page.goto(host_url, wait_until="domcontentloaded", timeout=60000)
+        # Arm the listener before navigating so a fast profile call isn't missed
+        profile_seen = True
+        navigated = False
+        try:
+            with page.expect_response(
+                lambda r: "/api/v3/" in r.url and _is_profile_op(_operation_name(r.url)),
+                timeout=8000,
+            ):
+                page.goto(host_url, wait_until="domcontentloaded", timeout=60000)
+                navigated = True
+        except PlaywrightTimeoutError:
+            # Only the profile-response wait may time out quietly; a failed navigation is an error
+            if not navigated:
+                raise
+            profile_seen = False
         
         if dismiss_fn:
             try:
@@ -475,15 +623,16 @@ def capture_host_graphql(
             except Exception:
                 pass
         
-        # Wait for page to fully load
-        page.wait_for_timeout(3000)
+        # No profile call observed: let any in-flight GraphQL settle instead of a fixed sleep
+        if not profile_seen:
+            _wait_graphql_settled(page, pending, max_ms=5000)
         
         # Extract profile data from DOM
         logger.info("[HOST] Extracting profile data from DOM...")
         dom_profile = extract_profile_from_dom(page, logger)
         
-        # Wait a bit more for any lazy-loaded GraphQL requests
-        page.wait_for_timeout(2000)
+        # Give lazy-loaded GraphQL requests a chance, but return as soon as none are in flight
+        _wait_graphql_settled(page, pending)
         
     except Exception as e:
         logger.warning(f"[HOST] Error during profile capture: {e}")
@@ -496,12 +645,7 @@ def capture_host_graphql(
     # Heuristic: pick an API request that looks like "host listings" pagination
     listing_req = None
     for t in captured_requests:
-        vars_obj = t.get("variables") or {}
-        blob = json.dumps(vars_obj).lower()
-        mentions_listings = any(k in blob for k in ["listing", "listings"])
-        mentions_user = any(k in blob for k in ["user", "host"])
-        has_cursor = "cursor" in blob
-        if mentions_listings and (mentions_user or has_cursor):
+        if _is_listing_template(t):
             listing_req = t
             break
 
@@ -517,7 +661,11 @@ def capture_host_graphql(
 # Keep other functions unchanged - parse_host_profile_from_jsons, paginate_host_listings, etc.
 def parse_host_profile_from_jsons(json_blobs: List[Dict[str, Any]], logger: logging.Logger, dom_fallback: Dict[str, Any] = None) -> Dict[str, Any]:
     """
-    Enhanced: Best-effort deep scan for host profile fields from captured JSONs + DOM fallback.
+    Build the host profile dict from the DOM fallback.
+
+    `json_blobs` is accepted for API compatibility but is not scanned: the profile
+    comes entirely from `dom_fallback`, so this is a cheap key mapping and needs
+    no memoization (hashing the blobs would cost more than the call itself).
     """
     profile: Dict[str, Any] = {
         "name": None,
@@ -571,14 +719,15 @@ def parse_host_profile_from_jsons(json_blobs: List[Dict[str, Any]], logger: logg
 
 
 def _deep_items(o: Any):
-    """Yield every dict/list node in a nested structure."""
-    if isinstance(o, dict):
-        yield o
-        for v in o.values():
-            yield from _deep_items(v)
-    elif isinstance(o, list):
-        for v in o:
-            yield from _deep_items(v)
+    """Yield every dict node in a nested structure, depth-first in document order."""
+    stack = [o]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, dict):
+            yield n
+            stack.extend(reversed(list(n.values())))
+        elif isinstance(n, list):
+            stack.extend(reversed(n))
 
 
 def paginate_host_listings(
@@ -586,10 +735,15 @@ def paginate_host_listings(
     listing_req_template: Dict[str, Any],
     logger: logging.Logger,
     max_pages: int = 50,
+    playwright: Optional[Playwright] = None,
 ) -> List[str]:
     """
     Replays the captured 'host listings' GraphQL request across pages via 'cursor'.
     Returns a list of listingId strings.
+
+    When a Playwright instance is given, pages are fetched through one dedicated
+    APIRequestContext (template headers + session cookies baked in) that stays
+    open for the whole run; otherwise the browser context's own request client is used.
     """
     if not listing_req_template:
         logger.info("[HOST] No listing request template captured; returning empty list")
@@ -600,95 +754,124 @@ def paginate_host_listings(
     extensions = listing_req_template.get("extensions") or {}
     operationName = listing_req_template.get("operationName") or "HostListings"
 
+    if playwright is not None:
+        api: APIRequestContext = playwright.request.new_context(
+            base_url="https://www.airbnb.com",
+            extra_http_headers=headers,
+            storage_state=context.storage_state(),
+        )
+        call_headers: Optional[Dict[str, str]] = None
+    else:
+        api = context.request
+        call_headers = headers
+
     listing_ids: List[str] = []
+    seen: set = set()
     cursor: Optional[str] = None
     pages = 0
 
-    def _deep_set_cursor(obj: Any):
-        """Recursively set 'cursor' fields in a variables payload."""
+    def _find_cursor_slots(obj: Any, slots: List[tuple]):
+        """Collect (parent, key) pairs for every 'cursor' field in a variables payload."""
         if isinstance(obj, dict):
             for k, v in obj.items():
-                if k.lower() == "cursor":
-                    obj[k] = cursor
+                if k in _CURSOR_KEYS or k.lower() == "cursor":
+                    slots.append((obj, k))
                 else:
-                    _deep_set_cursor(v)
+                    _find_cursor_slots(v, slots)
         elif isinstance(obj, list):
             for i in range(len(obj)):
-                _deep_set_cursor(obj[i])
-
-    while pages < max_pages:
-        pages += 1
-
-        # Deep copy variables so we can mutate 'cursor'
-        vars_copy = json.loads(json.dumps(variables))
-        _deep_set_cursor(vars_copy)
+                _find_cursor_slots(obj[i], slots)
 
-        # Build request params/body
-        params = {
-            "operationName": operationName,
-            "variables": json.dumps(vars_copy),
-            "extensions": json.dumps(extensions),
-        }
+    is_post = (listing_req_template.get("method") or "GET").upper() == "POST"
+    extensions_json = orjson.dumps(extensions).decode()
 
-        if (listing_req_template.get("method") or "GET").upper() == "POST":
-            body = json.dumps({
-                "operationName": operationName,
-                "variables": vars_copy,
-                "extensions": extensions,
-            })
-            resp = context.request.post(
-                listing_req_template["url"],
-                headers=headers,
-                data=body,
-                timeout=30000,
-            )
-        else:
-            resp = context.request.get(
-                listing_req_template["url"],
-                headers=headers,
-                params=params,
-                timeout=30000,
-            )
-
-        if resp.status != 200:
-            logger.warning(f"[HOST] listings HTTP {resp.status}")
-            break
+    # Private copy of the variables; only its cursor slots change between pages
+    vars_copy = copy.deepcopy(variables)
+    cursor_slots: List[tuple] = []
+    _find_cursor_slots(vars_copy, cursor_slots)
 
-        try:
-            j = resp.json()
-        except Exception:
-            logger.warning("[HOST] listings: non-JSON response")
-            break
-
-        next_cursor: Optional[str] = None
-        found_this_page = 0
-
-        for node in _deep_items(j):
-            if not isinstance(node, dict):
-                continue
+    try:
+        while pages < max_pages:
+            pages += 1
+
+            for parent, key in cursor_slots:
+                parent[key] = cursor
+
+            # Build request params/body
+            if is_post:
+                body = orjson.dumps({
+                    "operationName": operationName,
+                    "variables": vars_copy,
+                    "extensions": extensions,
+                })
+                resp = api.post(
+                    listing_req_template["url"],
+                    headers=call_headers,
+                    data=body,
+                    timeout=30000,
+                )
+            else:
+                params = {
+                    "operationName": operationName,
+                    "variables": orjson.dumps(vars_copy).decode(),
+                    "extensions": extensions_json,
+                }
+                resp = api.get(
+                    listing_req_template["url"],
+                    headers=call_headers,
+                    params=params,
+                    timeout=30000,
+                )
+
+            if resp.status != 200:
+                logger.warning(f"[HOST] listings HTTP {resp.status}")
+                break
 
-            # Extract listing IDs (robust)
-            if "listingId" in node and str(node["listingId"]).isdigit():
-                listing_ids.append(str(node["listingId"]))
-                found_this_page += 1
-            elif "id" in node and str(node["id"]).isdigit() and any(
-                k in node for k in ("title", "name", "roomTypeCategory")
-            ):
-                listing_ids.append(str(node["id"]))
-                found_this_page += 1
+            try:
+                j = orjson.loads(resp.body())
+            except Exception:
+                logger.warning("[HOST] listings: non-JSON response")
+                break
+
+            next_cursor: Optional[str] = None
+            found_this_page = 0
+
+            for node in _deep_items(j):
+                # Extract listing IDs (robust); each candidate is stringified once
+                sid: Optional[str] = None
+                lid = node.get("listingId")
+                if lid is not None:
+                    sid = str(lid)
+                    if not sid.isdigit():
+                        sid = None
+                if sid is None and "id" in node and ("title" in node or "name" in node or "roomTypeCategory" in node):
+                    sid = str(node["id"])
+                    if not sid.isdigit():
+                        sid = None
+                if sid is not None:
+                    found_this_page += 1
+                    if sid not in seen:
+                        seen.add(sid)
+                        listing_ids.append(sid)
+
+                # Pick up next cursor from common fields (later names in the old scan win, so check them first)
+                for k in _NEXT_CURSOR_KEYS:
+                    val = node.get(k)
+                    if isinstance(val, str) and len(val) > 5:
+                        next_cursor = val
+                        break
 
-            # Pick up next cursor from common fields
-            for k in ("nextPageCursor", "nextCursor", "cursor", "next"):
-                val = node.get(k)
-                if isinstance(val, str) and len(val) > 5:
-                    next_cursor = val
+            logger.info(f"[HOST] listings page {pages}: +{found_this_page} items, next_cursor={bool(next_cursor)}")
 
-        # Dedupe while preserving order
-        listing_ids = list(dict.fromkeys(listing_ids))
-        logger.info(f"[HOST] listings page {pages}: +{found_this_page} items, next_cursor={bool(next_cursor)}")
+            if not next_cursor:
+                break
+            cursor = next_cursor
 
-        if not next_cursor:
-            break
-        cursor = next_cursor
+    finally:
+        if playwright is not None:
+            try:
+                api.dispose()
+            except Exception:
+                pass
 
     return listing_ids
\ No newline at end of file
@@ -1,5 +1,8 @@
 # export_csv.py
+import atexit
 import csv
+from concurrent.futures import ProcessPoolExecutor
+
 import Utils, SQL
 
 DEFAULT_COLUMNS = [
@@ -8,33 +11,78 @@ DEFAULT_COLUMNS = [
     "has_detailed_data","needs_detail_scraping","scraping_time"
 ]
 
+# 1 MiB write buffer: large dumps go out in few big write() calls
+_CSV_BUFFER = 1 << 20
+
+_export_db = None
+
+def get_export_db():
+    """Process-wide export connection, so back-to-back exports scan a warm page cache; closed at exit."""
+    global _export_db
+    if _export_db is None:
+        _export_db = Utils.connect_db()
+        atexit.register(_export_db.close)
+    return _export_db
+
 def fetch_rows(db, detailed_only=False):
-    rows = SQL.export_listings_by_type(db, detailed_only=detailed_only)
-    return rows
+    """Cursor over the export query; read it with fetchmany, not fetchall."""
+    return SQL.export_listings_by_type(db, detailed_only=detailed_only)
+
+def export_cursor(cur, path, header, row_fn=None, skip_empty=False):
+    """Stream an export cursor into a CSV at path in fetchmany batches; returns the row count.
+
+    row_fn maps each DB row to its CSV row. With skip_empty, an empty result writes no file.
+    """
+    batch = cur.fetchmany()
+    if not batch and skip_empty:
+        return 0
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER) as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        while batch:
+            w.writerows(batch if row_fn is None else map(row_fn, batch))
+            n += len(batch)
+            batch = cur.fetchmany()
+    return n
 
 def main(path="listings.csv", detailed_only=False, columns=None):
-    db = Utils.connect_db()
-    try:
-        cols = columns or DEFAULT_COLUMNS
-        rows = fetch_rows(db, detailed_only)
-        if not rows:
-            print("No rows to export.")
-            return
-        # rows are sqlite Row objects – ensure all columns exist
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=cols)
-            w.writeheader()
-            for r in rows:
-                out = {c: r[c] if c in r.keys() else None for c in cols}
-                w.writerow(out)
-        print(f"✓ Exported {len(rows)} rows to {path}")
-    finally:
-        db.close()
+    cols = columns or DEFAULT_COLUMNS
+    cur = fetch_rows(get_export_db(), detailed_only)
+    # map requested columns onto cursor positions – missing ones export as None
+    names = [d[0] for d in cur.description]
+    idx = [names.index(c) if c in names else None for c in cols]
+    n = export_cursor(cur, path, cols, lambda r: [None if i is None else r[i] for i in idx],
+                      skip_empty=True)
+    if not n:
+        print("No rows to export.")
+        return
+    print(f"✓ Exported {n} rows to {path}")
+
+def run_all(path="listings.csv", detailed_only=False, parallel=True):
+    """Full dump: both exports in parallel, each worker scanning on its own SQLite connection.
+
+    With parallel=False they run back to back in this process on the shared export connection.
+    """
+    import Export
+    if not parallel:
+        Export.main()
+        main(path, detailed_only)
+        return
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        jobs = [pool.submit(Export.main), pool.submit(main, path, detailed_only)]
+        for job in jobs:
+            job.result()
 
 if __name__ == "__main__":
     import argparse
     p = argparse.ArgumentParser()
     p.add_argument("--out", default="listings.csv", help="CSV file path")
     p.add_argument("--detailed-only", action="store_true", help="Export only rows with detailed data")
+    p.add_argument("--all", action="store_true", help="Also run the full Export.py dump, in parallel")
+    p.add_argument("--sequential", action="store_true", help="With --all, run the dumps back to back on one connection")
     args = p.parse_args()
-    main(args.out, args.detailed_only)
+    if args.all:
+        run_all(args.out, args.detailed_only, parallel=not args.sequential)
+    else:
+        main(args.out, args.detailed_only)